@@ -0,0 +1,314 @@
+"""界面热点路径的延迟基准，在 offscreen 平台上运行，不需要显示器
+
+测量：
+- 历史记录对话框在大量历史下从创建到第一次绘制的时间
+- 主窗口每秒一次的 update_countdown 的耗时（按进行中的任务数）
+- 各对话框的创建耗时，以及 BaseDialog 样式表重新解析的耗时
+- 新建、调整、完成任务流程中事件循环被阻塞的总时间
+- 启动后归档旧任务期间事件循环被阻塞的时间（历史跨一年，默认归档 90 天前的任务）
+
+对话框由定时器自动填写并确认。数据由 operations.generate 按固定种子生成，每次运行的数据都相同。
+--no-archive 关闭启动时的归档，历史全部留在热数据中。
+
+    python benchmarks/gui_latency.py --tasks 100000 --json gui.json
+"""
+import argparse
+import gc
+import json
+import logging
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+os.environ.setdefault('TEMPUS_WARMUP', '0')
+os.environ.setdefault('TEMPUS_EVENT_LOG', '0')
+
+# 与 run.pyw 相同：把 TempusPugnus 所在目录加入路径
+PARENT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(PARENT_DIR)
+
+from operations import seed_data, measure, summarize  # noqa: E402  同目录的 operations.py
+
+from PyQt6.QtWidgets import QApplication  # noqa: E402
+from PyQt6.QtCore import QObject, QEvent, QEventLoop, QTimer, QDateTime, QT_VERSION_STR  # noqa: E402
+
+from TempusPugnus.gui.main_window import TimeFistGUI  # noqa: E402
+from TempusPugnus.gui import dialogs  # noqa: E402
+from TempusPugnus.gui.dialogs.base_dialog import BaseDialog  # noqa: E402
+
+# 事件循环两次唤醒的间隔超过定时周期这么多才算阻塞
+STALL_TIMER_MS = 5
+STALL_THRESHOLD_MS = 16
+
+
+class StallMonitor(QObject):
+    """用一个短周期定时器检测事件循环阻塞：两次触发的间隔减去周期即为阻塞时间"""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._timer = QTimer(self)
+        self._timer.setInterval(STALL_TIMER_MS)
+        self._timer.timeout.connect(self._on_timeout)
+        self._last = None
+        self.stalls = []
+
+    def start(self):
+        self.stalls = []
+        self._last = time.perf_counter()
+        self._timer.start()
+
+    def stop(self):
+        self._on_timeout()
+        self._timer.stop()
+        return {
+            "stall_ms": sum(self.stalls),
+            "max_stall_ms": max(self.stalls, default=0.0),
+            "stalls": len(self.stalls),
+        }
+
+    def _on_timeout(self):
+        current = time.perf_counter()
+        gap = (current - self._last) * 1000 - STALL_TIMER_MS
+        if gap > STALL_THRESHOLD_MS:
+            self.stalls.append(gap)
+        self._last = current
+
+
+class PaintWaiter(QObject):
+    """等待某个窗口第一次绘制"""
+
+    def __init__(self, widget):
+        super().__init__()
+        self.loop = QEventLoop()
+        widget.installEventFilter(self)
+
+    def eventFilter(self, obj, event):
+        if event.type() == QEvent.Type.Paint:
+            obj.removeEventFilter(self)
+            self.loop.quit()
+        return False
+
+
+def process_events(ms):
+    """运行事件循环 ms 毫秒，让延后执行的回调（调整窗口大小、写入等）完成"""
+    loop = QEventLoop()
+    QTimer.singleShot(ms, loop.quit)
+    loop.exec()
+
+
+def answer_dialog(fill):
+    """下一轮事件循环中找到弹出的模态对话框，填写后确认"""
+    def run():
+        dialog = QApplication.activeModalWidget()
+        if dialog is None:
+            QTimer.singleShot(1, run)
+            return
+        fill(dialog)
+        dialog.accept()
+    QTimer.singleShot(0, run)
+
+
+def fill_task(dialog):
+    dialog.task_input.setPlainText("基准测试任务")
+    dialog.deadline_input.setDateTime(QDateTime.currentDateTime().addSecs(3600))
+
+
+def fill_adjust(dialog):
+    dialog.reason_input.setPlainText("基准测试")
+    dialog.new_deadline_input.setDateTime(QDateTime.currentDateTime().addSecs(7200))
+
+
+def fill_complete(dialog):
+    dialog.summary_input.setPlainText("完成")
+
+
+def wait_for_archive(gui, timeout_ms=60000):
+    """运行事件循环，直到启动时的分批归档结束（热数据任务数连续两次不变）"""
+    last = None
+    waited = 0
+    while waited < timeout_ms:
+        process_events(100)
+        waited += 100
+        count = len(gui.task_manager.tasks)
+        if count == last:
+            break
+        last = count
+    return len(gui.task_manager.tasks)
+
+
+def bench_history(gui, runs):
+    """历史记录对话框从创建到第一次绘制"""
+    results = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        dialog = dialogs.HistoryDialog(gui.task_manager, None)
+        created = time.perf_counter()
+        waiter = PaintWaiter(dialog)
+        dialog.show()
+        waiter.loop.exec()
+        painted = time.perf_counter()
+        dialog.close()
+        dialog.deleteLater()
+        process_events(10)
+        results.append({"create_ms": (created - started) * 1000,
+                        "paint_ms": (painted - created) * 1000,
+                        "total_ms": (painted - started) * 1000})
+    return results
+
+
+def bench_countdown(gui, rows, ticks):
+    """有 rows 个进行中任务时 update_countdown 的单次耗时（微秒）"""
+    deadline = datetime.now() + timedelta(hours=2)
+    while len(gui.task_rows) < rows:
+        gui.show_task(gui.task_manager.create_task(f"倒计时 {len(gui.task_rows)}", deadline))
+    process_events(50)
+    current = datetime.now()
+    timings = measure(gui.update_countdown, [(current + timedelta(seconds=i),) for i in range(ticks)])
+    for task in list(gui.task_manager.get_tasks_by_status("进行中")):
+        if task.task.startswith("倒计时"):
+            gui.task_manager.complete_task(task.id, "")
+            gui.remove_task(task)
+    process_events(50)
+    return summarize(timings)
+
+
+def bench_construction(runs):
+    """各对话框的创建耗时（微秒），以及 BaseDialog 样式表重新解析并应用的耗时"""
+    results = {}
+    for name in ("TaskDialog", "AdjustTimeDialog", "CompleteTaskDialog", "ReminderDialog"):
+        cls = getattr(dialogs, name)
+        cls().deleteLater()  # 第一次创建包含导入和字体加载，不计入
+
+        def construct():
+            dialog = cls()
+            dialog.ensurePolished()
+            dialog.deleteLater()
+        results[name] = summarize(measure(construct, [()] * runs))
+        process_events(10)
+
+    def construct_base():
+        dialog = BaseDialog("基准")
+        dialog.ensurePolished()
+        dialog.deleteLater()
+    results["BaseDialog"] = summarize(measure(construct_base, [()] * runs))
+
+    dialog = dialogs.TaskDialog()
+    sheet = dialog.styleSheet()
+    # 两个内容不同的样式表交替设置，每次都会重新解析并应用到所有子控件
+    sheets = [(sheet + " " * (i % 2),) for i in range(runs)]
+
+    def apply(text):
+        dialog.setStyleSheet(text)
+        dialog.ensurePolished()
+    results["stylesheet_apply"] = summarize(measure(apply, sheets))
+    dialog.deleteLater()
+    process_events(10)
+    return results
+
+
+def bench_flows(gui, runs):
+    """新建、调整、完成任务整个流程中的耗时和事件循环阻塞时间"""
+    monitor = StallMonitor()
+    flows = {"create": [], "adjust": [], "complete": []}
+    for _ in range(runs):
+        for name, fill, handler in (("create", fill_task, gui.create_new_task),
+                                    ("adjust", fill_adjust, gui.adjust_task_time),
+                                    ("complete", fill_complete, gui.complete_task)):
+            monitor.start()
+            started = time.perf_counter()
+            answer_dialog(fill)
+            handler()
+            handled = time.perf_counter()
+            # 流程结束后的延后回调也算在内
+            process_events(100)
+            result = monitor.stop()
+            result["handler_ms"] = (handled - started) * 1000
+            flows[name].append(result)
+    summary = {}
+    for name, results in flows.items():
+        summary[name] = {key: sum(result[key] for result in results) / len(results)
+                         for key in ("handler_ms", "stall_ms", "max_stall_ms")}
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="在 offscreen 平台上测量界面热点路径的延迟")
+    parser.add_argument("--tasks", type=int, default=100000, help="历史任务数")
+    parser.add_argument("--runs", type=int, default=5, help="历史记录对话框和各流程的重复次数")
+    parser.add_argument("--rows", type=int, default=10, help="测倒计时时进行中的任务数")
+    parser.add_argument("--ticks", type=int, default=1000, help="update_countdown 的调用次数")
+    parser.add_argument("--no-archive", action="store_true", help="启动时不归档旧任务")
+    parser.add_argument("--json", help="把结果写入 JSON 文件")
+    args = parser.parse_args()
+    if args.no_archive:
+        os.environ['TEMPUS_ARCHIVE_DAYS'] = '36500'
+
+    app = QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as data_dir:
+        seed_data(data_dir, args.tasks, os.environ.get('TEMPUS_STORAGE', 'journal'))
+        started = time.perf_counter()
+        gui = TimeFistGUI(data_dir)
+        gc.freeze()  # 与 main() 相同
+        logging.getLogger('TaskManager').setLevel(logging.WARNING)
+        monitor = StallMonitor()
+        monitor.start()
+        waiter = PaintWaiter(gui)
+        gui.show()
+        waiter.loop.exec()
+        first_paint_ms = (time.perf_counter() - started) * 1000
+        # 启动时的归档在第一次绘制前后开始，分批进行
+        hot_tasks = wait_for_archive(gui)
+        startup = monitor.stop()
+        startup["hot_tasks"] = hot_tasks
+        gui.task_manager.flush()
+
+        results = {
+            "first_paint_ms": first_paint_ms,
+            "startup": startup,
+            "history_dialog": bench_history(gui, args.runs),
+            "update_countdown": bench_countdown(gui, args.rows, args.ticks),
+            "construction": bench_construction(max(args.runs, 20)),
+            "flows": bench_flows(gui, args.runs),
+        }
+        gui.close()
+        gui.task_manager.close()
+
+    history = results["history_dialog"]
+    print(f"主窗口第一次绘制: {first_paint_ms:.1f} ms")
+    startup = results["startup"]
+    print(f"启动归档: 剩余热数据 {startup['hot_tasks']} 个任务，阻塞共 {startup['stall_ms']:.1f} ms，"
+          f"最长 {startup['max_stall_ms']:.1f} ms")
+    print("历史记录对话框: " + "，".join(
+        f"{key} {min(run[key] for run in history):.1f}~{max(run[key] for run in history):.1f} ms"
+        for key in ("create_ms", "paint_ms", "total_ms")))
+    countdown = results["update_countdown"]
+    print(f"update_countdown（{args.rows} 行）: 中位数 {countdown['median_us']:.1f} us，"
+          f"p95 {countdown['p95_us']:.1f} us")
+    for name, stats in results["construction"].items():
+        label = "重新应用样式表" if name == "stylesheet_apply" else f"创建 {name}"
+        print(f"{label:<24} 中位数 {stats['median_us'] / 1000:.2f} ms")
+    for name, stats in results["flows"].items():
+        print(f"流程 {name:<8} 处理 {stats['handler_ms']:.1f} ms，阻塞共 {stats['stall_ms']:.1f} ms，"
+              f"最长 {stats['max_stall_ms']:.1f} ms")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({
+                "benchmark": "gui_latency",
+                "python": platform.python_version(),
+                "qt": QT_VERSION_STR,
+                "platform": platform.platform(),
+                "qpa": os.environ.get('QT_QPA_PLATFORM'),
+                "tasks": args.tasks,
+                "rows": args.rows,
+                "results": results,
+            }, f, ensure_ascii=False, indent=4)
+    app.quit()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,228 @@
+"""TaskManager 操作基准：在 1k / 100k / 1M 规模的模拟历史上测量常用操作的耗时
+
+历史记录由固定种子的随机数生成，任务分布在最近一年，带有调整记录、完成和超时，
+每次运行的数据都相同。结果写成 JSON，用 --compare 与旧版本的结果比较。
+
+    python benchmarks/operations.py --sizes 1000,100000 --json ops.json
+    python benchmarks/operations.py --sizes 1000,100000 --compare ops.json
+    python benchmarks/operations.py --sizes 1000 --events /path/to/data   # 用真实事件记录作负载
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import sys
+import tempfile
+import time
+from datetime import timedelta
+
+# 与 run.pyw 相同：把 TempusPugnus 所在目录加入路径
+PARENT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(PARENT_DIR)
+
+from TempusPugnus.core.task_manager import TaskManager
+from TempusPugnus.core.storage import create_storage
+from TempusPugnus.core.models import now, format_time
+
+DEFAULT_SIZES = [1000, 100000, 1000000]
+REASONS = ["被打断", "低估了工作量", "开会", "需求变了", "等别人回复", "休息一下", ""]
+WORDS = ["写周报", "读论文", "修复登录问题", "整理笔记", "代码评审", "准备演示", "回复邮件",
+         "健身", "背单词", "重构存储层", "写测试", "看文档", "画原型", "review PR"]
+# 结果相差超过这个比例时在 --compare 中标出
+REGRESSION_RATIO = 1.2
+
+
+def generate(count, days=365, seed=0):
+    """生成 count 个按开始时间排序的任务（存储格式的字典），最后几个仍在进行中"""
+    rng = random.Random(seed)
+    end = now().replace(microsecond=0)
+    base = end - timedelta(days=days)
+    step = timedelta(days=days) / max(count, 1)
+    for i in range(count):
+        start = base + step * i
+        initial = start + timedelta(minutes=rng.choice((15, 25, 30, 45, 60, 90)))
+        deadline = initial
+        adjustments = []
+        for n in range(rng.choice((0, 0, 0, 1, 1, 2, 3))):
+            time_ = deadline - timedelta(minutes=rng.randint(1, 10))
+            new_deadline = deadline + timedelta(minutes=rng.choice((5, 10, 15, 30)))
+            adjustments.append({
+                "time": format_time(time_), "reason": rng.choice(REASONS),
+                "original_deadline": format_time(deadline), "new_deadline": format_time(new_deadline),
+                "adjustment_count": n + 1,
+            })
+            deadline = new_deadline
+        in_progress = i >= count - 3
+        timed_out = not in_progress and rng.random() < 0.15
+        completion = None
+        if not in_progress:
+            completion = deadline + timedelta(minutes=rng.randint(-20, 30 if timed_out else 0))
+        yield {
+            "id": f"bench-{i:07d}",
+            "task": f"{rng.choice(WORDS)} #{i}",
+            "start_time": format_time(start),
+            "initial_deadline": format_time(initial),
+            "current_deadline": format_time(deadline),
+            "adjustments": adjustments,
+            "completion_time": format_time(completion),
+            "summary": "完成" if completion and not timed_out else "",
+            "status": "进行中" if in_progress else ("已超时" if timed_out else "已完成"),
+            "total_adjustments": len(adjustments),
+            "total_adjusted_time": (deadline - initial).total_seconds(),
+        }
+
+
+def seed_data(data_dir, count, storage_kind):
+    """直接写入存储，不经过 TaskManager，这样准备数据的时间不计入结果"""
+    create_storage(storage_kind, data_dir).save(list(generate(count)), [])
+
+
+def measure(fn, args_list):
+    """依次执行 fn(*args)，返回各次耗时（微秒）"""
+    timings = []
+    for args in args_list:
+        started = time.perf_counter()
+        fn(*args)
+        timings.append((time.perf_counter() - started) * 1e6)
+    return timings
+
+
+def summarize(timings):
+    timings = sorted(timings)
+    return {
+        "calls": len(timings),
+        "total_ms": sum(timings) / 1000,
+        "median_us": statistics.median(timings),
+        "p95_us": timings[min(len(timings) - 1, int(len(timings) * 0.95))],
+        "max_us": timings[-1],
+    }
+
+
+def run_size(count, ops, storage_kind, events_dir=None):
+    """在一个 count 个任务的数据目录上测量各个操作，返回 操作名 -> 统计"""
+    rng = random.Random(1)
+    results = {}
+    with tempfile.TemporaryDirectory() as data_dir:
+        seed_data(data_dir, count, storage_kind)
+
+        started = time.perf_counter()
+        task_manager = TaskManager(data_dir, storage_kind)
+        results["open"] = summarize([(time.perf_counter() - started) * 1e6])
+        # 日志会输出到控制台，这里只保留错误（日志在第一次创建 TaskManager 时才配置）
+        logging.getLogger('TaskManager').setLevel(logging.WARNING)
+        # 重复加载时存储已经打开，测的是读取 + 建索引
+        results["load_tasks"] = summarize(measure(task_manager.load_tasks, [()] * 3))
+
+        def save():
+            task_manager.save_tasks()
+            task_manager.flush()
+        results["save_tasks"] = summarize(measure(save, [()] * 3))
+
+        ids = [task.id for task in task_manager.tasks]
+        dates = task_manager.get_dates()
+        results["get_task_by_id"] = summarize(measure(
+            task_manager.get_task_by_id, [(rng.choice(ids),) for _ in range(ops)]))
+        results["get_tasks_by_date"] = summarize(measure(
+            lambda: task_manager.get_tasks_by_date(limit=30), [()] * 100))
+        results["get_tasks_by_date_range"] = summarize(measure(
+            task_manager.get_tasks_by_date, [(date, date) for date in rng.choices(dates, k=ops)]))
+        results["get_task_detail_text"] = summarize(measure(
+            task_manager.get_task_detail_text,
+            [(task_manager.get_task_by_id(rng.choice(ids)),) for _ in range(ops)]))
+        results["get_history_text"] = summarize(measure(task_manager.get_history_text, [()]))
+
+        # 修改操作只测提交的耗时，写盘在后台线程，最后单独计入 flush
+        deadline = now() + timedelta(hours=1)
+        created = []
+        results["create_task"] = summarize(measure(
+            lambda i: created.append(task_manager.create_task(f"新任务 {i}", deadline)),
+            [(i,) for i in range(ops)]))
+        results["adjust_task"] = summarize(measure(
+            task_manager.adjust_task,
+            [(task.id, deadline + timedelta(minutes=10), "基准测试") for task in created]))
+        results["complete_task"] = summarize(measure(
+            task_manager.complete_task, [(task.id, "完成") for task in created]))
+        results["flush"] = summarize(measure(task_manager.flush, [()]))
+
+        if events_dir:
+            from TempusPugnus.core.event_log import EventLog
+            from TempusPugnus.core.replay import drive
+            events = list(EventLog(events_dir).iter_events())
+            started = time.perf_counter()
+            counts = drive(task_manager, events)
+            task_manager.flush()
+            elapsed = time.perf_counter() - started
+            results["replay_drive"] = summarize([elapsed * 1e6])
+            results["replay_drive"]["operations"] = counts
+        task_manager.close()
+    return results
+
+
+def compare(current, previous):
+    """打印与上一次结果的中位数之比，返回变慢超过 REGRESSION_RATIO 的项数"""
+    regressions = 0
+    for size, ops in current.items():
+        old_ops = previous.get(size, {})
+        for name, stats in ops.items():
+            old = old_ops.get(name)
+            if not old or not old["median_us"]:
+                continue
+            ratio = stats["median_us"] / old["median_us"]
+            mark = ""
+            if ratio > REGRESSION_RATIO:
+                mark = "  ← 变慢"
+                regressions += 1
+            print(f"{size:>8} {name:<24} {old['median_us']:>12.1f} → {stats['median_us']:>12.1f} us"
+                  f"  ×{ratio:.2f}{mark}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="测量 TaskManager 常用操作在不同数据规模下的耗时")
+    parser.add_argument("--sizes", default=",".join(str(size) for size in DEFAULT_SIZES),
+                        help="任务数，逗号分隔，默认 1000,100000,1000000")
+    parser.add_argument("--ops", type=int, default=1000, help="每个单次操作重复的次数")
+    parser.add_argument("--storage", choices=["journal", "sqlite"], default="journal")
+    parser.add_argument("--event-log", action="store_true", help="同时写事件记录（默认关闭）")
+    parser.add_argument("--events", metavar="DATA_DIR",
+                        help="把该数据目录的事件记录通过 TaskManager 重新执行一遍，计入 replay_drive")
+    parser.add_argument("--json", help="把结果写入 JSON 文件")
+    parser.add_argument("--compare", metavar="JSON", help="与之前保存的结果比较")
+    args = parser.parse_args()
+
+    if not args.event_log:
+        os.environ['TEMPUS_EVENT_LOG'] = '0'
+
+    previous = None
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            previous = json.load(f)["results"]
+
+    results = {}
+    for size in (int(size) for size in args.sizes.split(",")):
+        results[str(size)] = run_size(size, args.ops, args.storage, args.events)
+        for name, stats in results[str(size)].items():
+            print(f"{size:>8} {name:<24} 中位数 {stats['median_us']:>12.1f} us  "
+                  f"p95 {stats['p95_us']:>12.1f} us  共 {stats['calls']} 次")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({
+                "benchmark": "operations",
+                "python": platform.python_version(),
+                "platform": platform.platform(),
+                "storage": args.storage,
+                "event_log": args.event_log,
+                "ops": args.ops,
+                "results": results,
+            }, f, ensure_ascii=False, indent=4)
+    if previous is not None:
+        if compare(results, previous):
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,140 @@
+"""启动时间基准：从进程启动到 TimeFistGUI 第一次绘制完成
+
+每次启动一个新的 Python 进程，父进程计时到子进程报告第一次绘制为止（包括解释器启动和导入）。
+数据放在临时目录，可用 --tasks 预先导入一批任务。
+
+    python benchmarks/startup.py --runs 10 --tasks 1000 --json startup.json
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# 与 run.pyw 相同：把 TempusPugnus 所在目录加入路径
+PARENT_DIR = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+sys.path.append(PARENT_DIR)
+
+FIRST_PAINT = "FIRST_PAINT"
+
+
+def child(data_dir):
+    """子进程：创建主窗口，第一次绘制后输出各阶段耗时并退出"""
+    started = time.perf_counter()
+    from PyQt6.QtWidgets import QApplication
+    from PyQt6.QtCore import QObject, QEvent
+    from TempusPugnus.gui.main_window import TimeFistGUI
+    imported = time.perf_counter()
+
+    app = QApplication(sys.argv)
+    gui = TimeFistGUI(data_dir)
+    created = time.perf_counter()
+
+    class PaintWatcher(QObject):
+        def eventFilter(self, obj, event):
+            if event.type() == QEvent.Type.Paint:
+                painted = time.perf_counter()
+                print(FIRST_PAINT, json.dumps({
+                    "import_ms": (imported - started) * 1000,
+                    "create_ms": (created - imported) * 1000,
+                    "paint_ms": (painted - created) * 1000,
+                }), flush=True)
+                app.quit()
+            return False
+
+    watcher = PaintWatcher()
+    gui.installEventFilter(watcher)
+    gui.show()
+    app.exec()
+    gui.task_manager.close()
+
+
+def seed(data_dir, count):
+    """预先导入 count 个已完成的任务，分布在最近 60 天"""
+    from datetime import timedelta
+    from TempusPugnus.core.task_manager import TaskManager
+    from TempusPugnus.core.models import now, format_time
+
+    task_manager = TaskManager(data_dir)
+    base = now() - timedelta(days=60)
+    step = timedelta(days=60) / max(count, 1)
+    records = []
+    for i in range(count):
+        start = base + step * i
+        records.append((i + 1, {
+            "task": f"任务 {i}",
+            "start_time": format_time(start),
+            "initial_deadline": format_time(start + timedelta(minutes=30)),
+            "completion_time": format_time(start + timedelta(minutes=25)),
+        }))
+    task_manager.import_tasks(records)
+    task_manager.close()
+
+
+def run(runs, tasks):
+    env = dict(os.environ)
+    env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+    env['TEMPUS_WARMUP'] = '0'
+    results = []
+    with tempfile.TemporaryDirectory() as data_dir:
+        if tasks:
+            seed(data_dir, tasks)
+        for _ in range(runs):
+            started = time.perf_counter()
+            proc = subprocess.Popen(
+                [sys.executable, os.path.abspath(__file__), "--child", data_dir],
+                stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, env=env, text=True
+            )
+            for line in proc.stdout:
+                if line.startswith(FIRST_PAINT):
+                    total = (time.perf_counter() - started) * 1000
+                    result = json.loads(line[len(FIRST_PAINT):])
+                    result["total_ms"] = total
+                    results.append(result)
+                    break
+            proc.wait()
+    return results
+
+
+def summarize(results):
+    summary = {}
+    for key in ("total_ms", "import_ms", "create_ms", "paint_ms"):
+        values = [result[key] for result in results]
+        summary[key] = {
+            "median": statistics.median(values),
+            "min": min(values),
+            "max": max(values),
+        }
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="测量从进程启动到主窗口第一次绘制的时间")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--tasks", type=int, default=0, help="预先导入的任务数")
+    parser.add_argument("--json", help="把结果写入 JSON 文件")
+    parser.add_argument("--child", metavar="DATA_DIR", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        child(args.child)
+        return
+
+    results = run(args.runs, args.tasks)
+    if not results:
+        print("子进程没有报告绘制完成", file=sys.stderr)
+        sys.exit(1)
+    summary = summarize(results)
+    for key, values in summary.items():
+        print(f"{key:>10}: 中位数 {values['median']:.1f}  最小 {values['min']:.1f}  最大 {values['max']:.1f}")
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump({"benchmark": "startup", "runs": args.runs, "tasks": args.tasks,
+                       "summary": summary, "results": results}, f, indent=4)
+
+
+if __name__ == '__main__':
+    main()
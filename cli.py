@@ -0,0 +1,283 @@
+"""TempusPugnus 命令行工具，只依赖 core，不导入 Qt
+
+    python -m TempusPugnus.cli start "写周报" --minutes 45
+    python -m TempusPugnus.cli adjust --minutes 20 --reason "被打断"
+    python -m TempusPugnus.cli complete --summary "写完了"
+    python -m TempusPugnus.cli list
+    python -m TempusPugnus.cli stats --days 7
+    python -m TempusPugnus.cli export --format csv -o tasks.csv --adjustments adjustments.csv
+    python -m TempusPugnus.cli import tasks.csv --adjustments adjustments.csv
+    python -m TempusPugnus.cli replay --until "2024-05-01 00:00:00" -o snapshot_dir
+    TEMPUS_METRICS=1 python -m TempusPugnus.cli metrics --format prometheus
+
+图形界面运行时请不要用命令行修改任务，两边会互相覆盖；list、stats、export 等查询命令只读数据文件，可以随时使用。
+"""
+import argparse
+import os
+import sys
+import time
+from datetime import datetime, timedelta
+
+from TempusPugnus.core.task_manager import TaskManager
+from TempusPugnus.core.models import now, format_time
+
+EXPORT_FORMATS = ["csv", "jsonl", "text"]
+
+
+class CommandError(Exception):
+    """命令参数有误，信息直接显示给用户"""
+
+
+def _deadline(args):
+    """由 --minutes（从现在起）或 --until（"HH:MM" 或 "YYYY-MM-DD HH:MM"）得到截止时间"""
+    if args.minutes is not None:
+        if args.minutes <= 0:
+            raise CommandError("--minutes 必须大于 0")
+        return now() + timedelta(minutes=args.minutes)
+    try:
+        if len(args.until) <= 5:
+            clock = datetime.strptime(args.until, "%H:%M").time()
+            deadline = datetime.combine(now().date(), clock)
+            # 今天的这个时间已经过了就是明天
+            if deadline <= now():
+                deadline += timedelta(days=1)
+            return deadline
+        return datetime.fromisoformat(args.until)
+    except ValueError:
+        raise CommandError(f"无法识别的时间: {args.until}")
+
+
+def _find_task(task_manager, task_id):
+    """按 id（或 id 开头几位）查找任务；不给 id 时取唯一的进行中任务"""
+    if task_id:
+        task = task_manager.get_task_by_id(task_id)
+        if task is not None:
+            return task
+        matches = [task for task in task_manager.tasks if task.id.startswith(task_id)]
+        if len(matches) == 1:
+            return matches[0]
+        raise CommandError(f"找不到任务 {task_id}" if not matches else f"有多个任务的 id 以 {task_id} 开头")
+    active = task_manager.get_tasks_by_status("进行中")
+    if len(active) == 1:
+        return active[0]
+    raise CommandError("当前没有进行中的任务" if not active else "有多个进行中的任务，请指定 id")
+
+
+def _remaining(task):
+    remaining = task.current_deadline - now()
+    if remaining.total_seconds() <= 0:
+        return "时间到！"
+    return str(remaining).split('.')[0]
+
+
+def cmd_start(task_manager, args):
+    task = task_manager.create_task(args.description, _deadline(args))
+    print(task.id)
+    return 0
+
+
+def cmd_adjust(task_manager, args):
+    task = _find_task(task_manager, args.id)
+    task_manager.adjust_task(task.id, _deadline(args), args.reason)
+    print(f"{task.task}: 截止时间改为 {format_time(task.current_deadline)}")
+    return 0
+
+
+def cmd_complete(task_manager, args):
+    task = _find_task(task_manager, args.id)
+    task_manager.complete_task(task.id, args.summary)
+    print(f"完成任务: {task.task}")
+    return 0
+
+
+def cmd_list(task_manager, args):
+    tasks = sorted(task_manager.get_tasks_by_status(args.status), key=lambda task: task.start_time)
+    if args.limit:
+        tasks = tasks[-args.limit:]
+    for task in tasks:
+        if task.status == "进行中":
+            print(f"{task.id[:8]}  {_remaining(task):>10}  {task.task}")
+        else:
+            print(f"{task.id[:8]}  {format_time(task.start_time)}  {task.task}")
+    return 0
+
+
+def cmd_stats(task_manager, args):
+    start_date = None
+    if not args.all:
+        start_date = (now() - timedelta(days=args.days - 1)).strftime('%Y-%m-%d')
+    stats = task_manager.get_stats(start_date, include_archived=args.all)
+    if not stats["total"]:
+        print("这段时间没有任务。")
+        return 0
+    print(f"任务总数: {stats['total']}（已完成 {stats['completed']}，已超时 {stats['timed_out']}，"
+          f"进行中 {stats['in_progress']}）")
+    print(f"完成率: {stats['completion_rate']:.1%}")
+    print(f"调整过的任务: {stats['adjusted_ratio']:.1%}，平均推迟 "
+          f"{timedelta(seconds=int(stats['avg_slippage']))}")
+    print("完成时间与初始截止时间相比: " + "，".join(
+        f"{label} {count}" for label, count in stats["overrun"].items()))
+    print("按星期完成数: " + "，".join(f"{day} {count}" for day, count in stats["by_weekday"].items()))
+    return 0
+
+
+def cmd_export(task_manager, args):
+    from TempusPugnus.core.export import export_tasks
+    out = open(args.output, 'w', encoding='utf-8', newline='') if args.output else sys.stdout
+    adjustments_out = None
+    try:
+        if args.adjustments:
+            adjustments_out = open(args.adjustments, 'w', encoding='utf-8', newline='')
+        tasks = task_manager.iter_tasks(args.start, args.end, args.status,
+                                        include_archived=not args.no_archive)
+        count = export_tasks(tasks, out, args.format, adjustments_out)
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        if adjustments_out is not None:
+            adjustments_out.close()
+    print(f"导出了 {count} 个任务", file=sys.stderr)
+    return 0
+
+
+def _file_format(path, fmt):
+    if fmt:
+        return fmt
+    return "jsonl" if os.path.splitext(path)[1].lower() in (".jsonl", ".json") else "csv"
+
+
+def cmd_import(task_manager, args):
+    from TempusPugnus.core.importer import read_records, read_adjustments
+    adjustments = None
+    if args.adjustments:
+        with open(args.adjustments, 'r', encoding='utf-8-sig', newline='') as f:
+            adjustments = read_adjustments(f, _file_format(args.adjustments, args.format))
+    with open(args.file, 'r', encoding='utf-8-sig', newline='') as f:
+        report = task_manager.import_tasks(read_records(f, _file_format(args.file, args.format)), adjustments)
+    # 等待写入磁盘，计入总耗时
+    started = time.perf_counter()
+    task_manager.flush()
+    print(report)
+    print(f"写入磁盘用时 {time.perf_counter() - started:.2f} 秒")
+    return 1 if report.errors and not report.imported else 0
+
+
+def cmd_replay(task_manager, args):
+    from TempusPugnus.core.replay import replay
+    from TempusPugnus.core.storage import create_storage
+    if task_manager.event_log is None:
+        raise CommandError("事件记录已关闭（TEMPUS_EVENT_LOG=0）")
+    # 先写完排队中的事件
+    task_manager.flush()
+    started = time.perf_counter()
+    tasks, reminders, count = replay(task_manager.event_log.iter_events(args.until))
+    elapsed = time.perf_counter() - started
+    by_status = {}
+    for task in tasks:
+        by_status[task['status']] = by_status.get(task['status'], 0) + 1
+    print(f"重放 {count} 条事件，用时 {elapsed:.2f} 秒（{count / elapsed if elapsed else 0:.0f} 条/秒）")
+    print(f"任务 {len(tasks)} 个（" + "，".join(f"{status} {n}" for status, n in by_status.items())
+          + f"），提醒 {len(reminders)} 个")
+    if args.output:
+        os.makedirs(args.output, exist_ok=True)
+        create_storage(os.environ.get('TEMPUS_STORAGE', 'journal'), args.output).save(tasks, reminders)
+        print(f"已写入 {args.output}")
+    return 0
+
+
+def cmd_metrics(task_manager, args):
+    from TempusPugnus.core import metrics
+    if args.reset:
+        if os.path.exists(task_manager.metrics_file):
+            os.remove(task_manager.metrics_file)
+        metrics.reset()
+        print("已清空性能指标")
+        return 0
+    # 之前各次运行累加保存的数据，加上本次命令自己的
+    data = metrics.merge(metrics.load(task_manager.metrics_file), metrics.snapshot())
+    if not data["histograms"] and not data["counters"]:
+        print("还没有性能指标，请设置 TEMPUS_METRICS=1 后运行程序", file=sys.stderr)
+        return 1
+    print(metrics.to_prometheus(data) if args.format == "prometheus" else metrics.to_json(data), end="")
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m TempusPugnus.cli", description="TempusPugnus 命令行工具")
+    parser.add_argument("--data-dir", help="数据目录，默认与图形界面相同")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_deadline_arguments(subparser):
+        group = subparser.add_mutually_exclusive_group(required=True)
+        group.add_argument("--minutes", type=int, help="从现在起多少分钟")
+        group.add_argument("--until", help='截止时间，"HH:MM" 或 "YYYY-MM-DD HH:MM"')
+
+    start = subparsers.add_parser("start", help="新建任务")
+    start.add_argument("description", help="任务描述")
+    add_deadline_arguments(start)
+    start.set_defaults(func=cmd_start)
+
+    adjust = subparsers.add_parser("adjust", help="调整截止时间")
+    adjust.add_argument("id", nargs="?", help="任务 id 或其开头几位，默认为唯一的进行中任务")
+    add_deadline_arguments(adjust)
+    adjust.add_argument("--reason", default="", help="调整原因")
+    adjust.set_defaults(func=cmd_adjust)
+
+    complete = subparsers.add_parser("complete", help="完成任务")
+    complete.add_argument("id", nargs="?", help="任务 id 或其开头几位，默认为唯一的进行中任务")
+    complete.add_argument("--summary", default="", help="总结")
+    complete.set_defaults(func=cmd_complete)
+
+    listing = subparsers.add_parser("list", help="列出任务（默认为进行中的任务）")
+    listing.add_argument("--status", default="进行中")
+    listing.add_argument("--limit", type=int, help="只显示最近的几个")
+    listing.set_defaults(func=cmd_list, read_only=True)
+
+    stats = subparsers.add_parser("stats", help="统计")
+    stats.add_argument("--days", type=int, default=30, help="最近多少天，默认 30")
+    stats.add_argument("--all", action="store_true", help="全部记录（包括归档）")
+    stats.set_defaults(func=cmd_stats, read_only=True)
+
+    export = subparsers.add_parser("export", help="导出历史记录")
+    export.add_argument("--format", choices=EXPORT_FORMATS, default="csv")
+    export.add_argument("-o", "--output", help="输出文件，默认输出到标准输出")
+    export.add_argument("--adjustments", help="调整记录输出文件（csv / jsonl）")
+    export.add_argument("--from", dest="start", metavar="YYYY-MM-DD", help="起始日期（包含）")
+    export.add_argument("--to", dest="end", metavar="YYYY-MM-DD", help="结束日期（包含）")
+    export.add_argument("--status", help="只导出该状态的任务，例如 已完成")
+    export.add_argument("--no-archive", action="store_true", help="不包含已归档的任务")
+    export.set_defaults(func=cmd_export, read_only=True)
+
+    importer = subparsers.add_parser("import", help="从 CSV / JSONL 批量导入任务")
+    importer.add_argument("file", help="任务文件，字段与导出的任务表相同")
+    importer.add_argument("--format", choices=["csv", "jsonl"], help="默认按扩展名判断")
+    importer.add_argument("--adjustments", help="调整记录文件（导出的第二张表）")
+    importer.set_defaults(func=cmd_import)
+
+    replayer = subparsers.add_parser("replay", help="由事件记录重建任务状态")
+    replayer.add_argument("--until", metavar='"YYYY-MM-DD HH:MM:SS"', help="只重放到这个时刻为止")
+    replayer.add_argument("-o", "--output", help="把重建的任务写入该数据目录（可用 --data-dir 打开）")
+    replayer.set_defaults(func=cmd_replay, read_only=True)
+
+    metric = subparsers.add_parser("metrics", help="输出性能指标（需要 TEMPUS_METRICS=1）")
+    metric.add_argument("--format", choices=["prometheus", "json"], default="prometheus")
+    metric.add_argument("--reset", action="store_true", help="清空已保存的指标")
+    metric.set_defaults(func=cmd_metrics, read_only=True)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    # 只查询的命令不修改数据文件，图形界面运行时也可以调用
+    task_manager = TaskManager(args.data_dir, read_only=getattr(args, 'read_only', False))
+    try:
+        return args.func(task_manager, args)
+    except CommandError as e:
+        print(str(e), file=sys.stderr)
+        return 1
+    finally:
+        task_manager.close()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
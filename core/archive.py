@@ -0,0 +1,163 @@
+import os
+import gzip
+import json
+import threading
+
+from .models import Task
+from .rollups import DailyRollups
+from .storage import write_atomic
+
+
+class ArchiveStore:
+    """按月分片的冷数据归档
+
+    已结束的旧任务按开始时间所在月份写入 archive/YYYY-MM.json.gz，
+    manifest.json 记录每个分片的文件名、任务数、各日期的任务数和每日汇总。
+    启动时只读 manifest，分片在用户查看对应日期时才解压读取。
+
+    add() 只更新内存中的 manifest 并暂存任务对象，write_pending() 由后台写入线程调用，
+    先写分片再写 manifest，重复写入同一任务按 id 覆盖。lock 只保护内存中的数据，
+    读写分片、压缩都在锁外进行，界面线程查询时不会等待磁盘。
+    """
+
+    def __init__(self, data_dir):
+        self.archive_dir = os.path.join(data_dir, "archive")
+        self.manifest_file = os.path.join(self.archive_dir, "manifest.json")
+        self.lock = threading.Lock()
+        self._pending = {}  # 月份 -> {任务 id: 任务}，尚未写入分片
+        self.manifest = {"months": {}}
+        if os.path.exists(self.manifest_file):
+            with open(self.manifest_file, 'r', encoding='utf-8') as f:
+                self.manifest = json.load(f)
+
+    def months(self):
+        with self.lock:
+            return sorted(self.manifest["months"])
+
+    def dates(self):
+        """所有归档任务的日期 -> 任务数"""
+        with self.lock:
+            dates = {}
+            for entry in self.manifest["months"].values():
+                dates.update(entry["dates"])
+            return dates
+
+    def count_on(self, date):
+        """某天归档的任务数"""
+        with self.lock:
+            entry = self.manifest["months"].get(date[:7])
+            return entry["dates"].get(date, 0) if entry else 0
+
+    def rollups(self):
+        """所有归档日期的每日汇总；旧版 manifest 中没有汇总的月份读取分片补算"""
+        with self.lock:
+            missing = [month for month, entry in self.manifest["months"].items() if "rollups" not in entry]
+        for month in missing:
+            pending = self._pending_tasks(month)
+            tasks = {data['id']: Task.from_dict(data) for data in self._read_shard(month)}
+            tasks.update(pending)
+            rollups = DailyRollups()
+            for task in tasks.values():
+                rollups.add_task(task)
+            with self.lock:
+                self.manifest["months"][month].setdefault("rollups", rollups.days)
+        with self.lock:
+            days = {}
+            for entry in self.manifest["months"].values():
+                days.update(entry["rollups"])
+            return DailyRollups(days)
+
+    def add(self, tasks):
+        """登记要归档的任务，立即出现在 manifest 中，文件稍后由 write_pending 写入
+
+        这里只做计数，转换成字典、压缩和写文件都在 write_pending 中完成。
+        """
+        with self.lock:
+            rollups = {}  # 月份 -> 该月 manifest 中的汇总
+            for task in tasks:
+                date = task.date
+                month = date[:7]
+                pending = self._pending.setdefault(month, {})
+                if task.id in pending:
+                    continue
+                pending[task.id] = task
+                entry = self.manifest["months"].setdefault(
+                    month, {"file": f"{month}.json.gz", "count": 0, "dates": {}, "rollups": {}}
+                )
+                entry["count"] += 1
+                entry["dates"][date] = entry["dates"].get(date, 0) + 1
+                if "rollups" in entry:
+                    if month not in rollups:
+                        rollups[month] = DailyRollups(entry["rollups"])
+                    rollups[month].add_task(task)
+
+    def write_pending(self):
+        """把暂存的任务合并进各月分片并更新 manifest，失败时保留暂存数据以便重试
+
+        由后台写入线程调用。先在锁内取出暂存任务的副本，读取、压缩、写分片都在锁外；
+        每写完一个分片，按分片内容加上仍在暂存的任务重新统计该月，再在锁内更新 manifest。
+        """
+        with self.lock:
+            pending = {month: dict(tasks) for month, tasks in self._pending.items()}
+        if not pending:
+            return
+        os.makedirs(self.archive_dir, exist_ok=True)
+        for month in sorted(pending):
+            tasks = {data['id']: data for data in self._read_shard(month)}
+            tasks.update((task_id, task.to_dict()) for task_id, task in pending[month].items())
+            tasks = sorted(tasks.values(), key=lambda data: data['start_time'])
+            # 逐个任务序列化，不会长时间占住 GIL 让界面线程等待
+            data = ("[" + ",".join(json.dumps(task, ensure_ascii=False) for task in tasks) + "]").encode('utf-8')
+            write_atomic(self._shard_path(month), gzip.compress(data))
+            # 以分片实际内容为准重新统计（锁外），重复归档的任务不会被计两次，
+            # 上次写完分片但没来得及写 manifest 时也不会少算
+            ids = set()
+            dates = {}
+            rollups = DailyRollups()
+            for data in tasks:
+                task = Task.from_dict(data)
+                ids.add(task.id)
+                dates[task.date] = dates.get(task.date, 0) + 1
+                rollups.add_task(task)
+            # 每写完一个分片就更新，后面的分片失败重试时它的任务已不在暂存中
+            with self.lock:
+                remaining = self._pending.get(month, {})
+                for task_id in pending[month]:
+                    remaining.pop(task_id, None)
+                if not remaining:
+                    self._pending.pop(month, None)
+                # 写分片期间又暂存的任务还没写进分片，加在统计上
+                for task in remaining.values():
+                    if task.id not in ids:
+                        dates[task.date] = dates.get(task.date, 0) + 1
+                        rollups.add_task(task)
+                self.manifest["months"][month] = {
+                    "file": f"{month}.json.gz", "count": sum(dates.values()), "dates": dates,
+                    "rollups": rollups.days
+                }
+
+        with self.lock:
+            text = json.dumps(self.manifest, indent=4, ensure_ascii=False)
+        write_atomic(self.manifest_file, text)
+
+    def load_month(self, month):
+        """读取某月分片中的全部任务字典（包括尚未写入的暂存任务）"""
+        # 先取暂存任务再读分片：暂存任务在分片写完后才移除，两者合起来不会漏掉任务
+        pending = self._pending_tasks(month)
+        tasks = {data['id']: data for data in self._read_shard(month)}
+        tasks.update((task_id, task.to_dict()) for task_id, task in pending.items())
+        return sorted(tasks.values(), key=lambda data: data['start_time'])
+
+    def _pending_tasks(self, month):
+        with self.lock:
+            return dict(self._pending.get(month, {}))
+
+    def _shard_path(self, month):
+        return os.path.join(self.archive_dir, f"{month}.json.gz")
+
+    def _read_shard(self, month):
+        path = self._shard_path(month)
+        if not os.path.exists(path):
+            return []
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            return json.load(f)
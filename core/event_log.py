@@ -0,0 +1,56 @@
+import os
+import json
+
+
+class EventLog:
+    """永久保存的修改事件流
+
+    与 tasks.journal 使用相同的事件格式（见 storage.apply_event），但合并快照时不会清空，
+    按事件时间每月一个文件 events/YYYY-MM.jsonl。从头重放即可得到任意时刻的任务状态。
+    """
+
+    def __init__(self, data_dir):
+        self.log_dir = os.path.join(data_dir, "events")
+
+    def exists(self):
+        return bool(self.files())
+
+    def files(self):
+        if not os.path.isdir(self.log_dir):
+            return []
+        return sorted(
+            os.path.join(self.log_dir, name)
+            for name in os.listdir(self.log_dir) if name.endswith('.jsonl')
+        )
+
+    def append(self, events):
+        """按月份追加事件，由后台写入线程调用"""
+        os.makedirs(self.log_dir, exist_ok=True)
+        by_month = {}
+        for event in events:
+            by_month.setdefault(event['ts'][:7], []).append(
+                json.dumps(event, ensure_ascii=False) + "\n"
+            )
+        for month, lines in by_month.items():
+            with open(os.path.join(self.log_dir, f"{month}.jsonl"), 'a', encoding='utf-8') as f:
+                f.write("".join(lines))
+                f.flush()
+
+    def iter_events(self, until=None):
+        """按时间顺序逐条产生事件；until 为 "YYYY-MM-DD HH:MM:SS"，只产生不晚于它的事件"""
+        for path in self.files():
+            month = os.path.basename(path)[:7]
+            if until and month > until[:7]:
+                return
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    if not line.strip():
+                        continue
+                    try:
+                        event = json.loads(line)
+                    except ValueError:
+                        # 写到一半中断的最后一行
+                        continue
+                    if until and event['ts'] > until:
+                        return
+                    yield event
@@ -0,0 +1,97 @@
+import csv
+import json
+from datetime import timedelta
+
+from .models import format_time
+
+# 任务表不含调整记录，调整记录展开成第二张表，用 task_id 关联
+TASK_FIELDS = (
+    "id", "task", "start_time", "initial_deadline", "current_deadline",
+    "completion_time", "summary", "status", "total_adjustments", "total_adjusted_time"
+)
+ADJUSTMENT_FIELDS = (
+    "task_id", "adjustment_count", "time", "reason", "original_deadline", "new_deadline"
+)
+
+
+def task_record(task):
+    record = task.to_dict()
+    del record['adjustments']
+    return record
+
+
+def adjustment_records(task):
+    for adjustment in task.adjustments:
+        record = adjustment.to_dict()
+        record['task_id'] = task.id
+        yield record
+
+
+def history_text(task):
+    """单个任务的历史记录文字（与 get_history_text 的格式相同）"""
+    text = f"任务ID: {task.id}\n"
+    text += f"任务描述: {task.task}\n"
+    text += f"开始时间: {format_time(task.start_time)}\n"
+    text += f"初始截止时间: {format_time(task.initial_deadline)}\n"
+    text += f"当前截止时间: {format_time(task.current_deadline)}\n"
+    text += f"状态: {task.status}\n"
+    if task.completion_time:
+        text += f"完成时间: {format_time(task.completion_time)}\n"
+    if task.summary:
+        text += f"总结: {task.summary}\n"
+    text += f"总调整次数: {task.total_adjustments}\n"
+    text += f"总调整时长: {timedelta(seconds=int(task.total_adjusted_time))}\n"
+    text += "-" * 40 + "\n"
+    return text
+
+
+def write_csv(tasks, out, adjustments_out=None):
+    """逐个任务写入 CSV，调整记录写入 adjustments_out（可选），返回任务数"""
+    writer = csv.DictWriter(out, TASK_FIELDS)
+    writer.writeheader()
+    adjustment_writer = None
+    if adjustments_out is not None:
+        adjustment_writer = csv.DictWriter(adjustments_out, ADJUSTMENT_FIELDS)
+        adjustment_writer.writeheader()
+    count = 0
+    for task in tasks:
+        writer.writerow(task_record(task))
+        if adjustment_writer is not None:
+            adjustment_writer.writerows(adjustment_records(task))
+        count += 1
+    return count
+
+
+def write_jsonl(tasks, out, adjustments_out=None):
+    """每行一个任务的 JSON，调整记录同样每行一条写入 adjustments_out（可选），返回任务数"""
+    count = 0
+    for task in tasks:
+        out.write(json.dumps(task_record(task), ensure_ascii=False) + "\n")
+        if adjustments_out is not None:
+            for record in adjustment_records(task):
+                adjustments_out.write(json.dumps(record, ensure_ascii=False) + "\n")
+        count += 1
+    return count
+
+
+def write_text(tasks, out, adjustments_out=None):
+    """纯文本格式，调整记录不单独输出"""
+    count = 0
+    for task in tasks:
+        out.write(history_text(task))
+        count += 1
+    return count
+
+
+FORMATS = {
+    "csv": write_csv,
+    "jsonl": write_jsonl,
+    "text": write_text,
+}
+
+
+def export_tasks(tasks, out, fmt="csv", adjustments_out=None):
+    """把任务迭代器按 fmt 格式流式写出，内存占用与任务总数无关，返回任务数"""
+    if fmt not in FORMATS:
+        raise ValueError(f"未知的导出格式: {fmt}")
+    return FORMATS[fmt](tasks, out, adjustments_out)
@@ -0,0 +1,125 @@
+import csv
+import json
+import time
+import uuid
+
+from .models import Task, Adjustment, parse_time
+
+STATUSES = ("进行中", "已完成", "已超时")
+
+
+def read_records(f, fmt):
+    """逐条读取 CSV（首行为表头）或 JSON Lines 记录，产生 (行号, 字典)"""
+    if fmt == "csv":
+        reader = csv.DictReader(f)
+        for record in reader:
+            yield reader.line_num, record
+    elif fmt == "jsonl":
+        for line_num, line in enumerate(f, start=1):
+            if line.strip():
+                try:
+                    yield line_num, json.loads(line)
+                except ValueError as e:
+                    yield line_num, ValueError(f"JSON 格式错误: {str(e)}")
+    else:
+        raise ValueError(f"未知的导入格式: {fmt}")
+
+
+def read_adjustments(f, fmt):
+    """读取导出的调整记录表，返回 任务 id -> 调整记录列表"""
+    adjustments = {}
+    for _, record in read_records(f, fmt):
+        if isinstance(record, Exception):
+            raise record
+        adjustments.setdefault(record['task_id'], []).append(record)
+    return adjustments
+
+
+def _time(record, field, required=True):
+    value = record.get(field) or ""
+    try:
+        result = parse_time(value.strip())
+    except (ValueError, AttributeError):
+        raise ValueError(f"{field} 不是有效的时间: {value!r}")
+    if result is None and required:
+        raise ValueError(f"缺少 {field}")
+    if result is not None and result.tzinfo is not None:
+        # 程序中的时间都不带时区（本地时间），带时区的换算成本地时间，否则无法与其他时间比较
+        result = result.astimezone().replace(tzinfo=None)
+    return result.replace(microsecond=0) if result else None
+
+
+def build_task(record, adjustments=None):
+    """校验一条记录并转换成 Task，记录无效时抛出 ValueError
+
+    字段与导出的任务表相同；缺少 id 时新分配，调整记录可以嵌在 adjustments 字段里
+    或从单独的调整记录表传入。
+    """
+    if not isinstance(record, dict):
+        raise ValueError("记录不是对象")
+    description = (record.get('task') or "").strip()
+    if not description:
+        raise ValueError("缺少任务描述 task")
+    start_time = _time(record, 'start_time')
+    initial_deadline = _time(record, 'initial_deadline')
+    if initial_deadline < start_time:
+        raise ValueError("initial_deadline 早于 start_time")
+    completion_time = _time(record, 'completion_time', required=False)
+
+    raw_adjustments = adjustments if adjustments is not None else record.get('adjustments') or []
+    raw_adjustments = sorted(raw_adjustments, key=lambda adj: int(adj.get('adjustment_count') or 0))
+    task_adjustments = []
+    for count, adj in enumerate(raw_adjustments, start=1):
+        task_adjustments.append(Adjustment(
+            _time(adj, 'time'), adj.get('reason') or "",
+            _time(adj, 'original_deadline'), _time(adj, 'new_deadline'), count
+        ))
+
+    current_deadline = _time(record, 'current_deadline', required=False)
+    if current_deadline is None:
+        current_deadline = task_adjustments[-1].new_deadline if task_adjustments else initial_deadline
+
+    status = (record.get('status') or "").strip() or ("已完成" if completion_time else "进行中")
+    if status not in STATUSES:
+        raise ValueError(f"未知的状态: {status}")
+    if status == "已完成" and completion_time is None:
+        raise ValueError("状态为已完成但缺少 completion_time")
+
+    total_adjusted_time = record.get('total_adjusted_time')
+    if total_adjusted_time in (None, ""):
+        total_adjusted_time = (current_deadline - initial_deadline).total_seconds()
+    try:
+        total_adjusted_time = float(total_adjusted_time)
+    except (TypeError, ValueError):
+        raise ValueError(f"total_adjusted_time 不是数字: {total_adjusted_time!r}")
+
+    return Task(
+        (record.get('id') or "").strip() or str(uuid.uuid4()),
+        description, start_time, initial_deadline, current_deadline, task_adjustments,
+        completion_time, record.get('summary') or "", status,
+        len(task_adjustments), total_adjusted_time
+    )
+
+
+class ImportReport:
+    """一次导入的结果"""
+
+    def __init__(self):
+        self.imported = 0
+        self.skipped = 0    # id 已存在的记录
+        self.errors = []    # (行号, 错误信息)
+        self.elapsed = 0.0  # 读取、校验并加入内存的耗时（秒）
+        self.started = time.perf_counter()
+
+    @property
+    def rate(self):
+        return self.imported / self.elapsed if self.elapsed else 0.0
+
+    def __str__(self):
+        text = (f"导入 {self.imported} 个任务，跳过 {self.skipped} 个已存在的任务，"
+                f"{len(self.errors)} 条记录有错误；用时 {self.elapsed:.2f} 秒（{self.rate:.0f} 条/秒）")
+        for line_num, message in self.errors[:20]:
+            text += f"\n  第 {line_num} 行: {message}"
+        if len(self.errors) > 20:
+            text += f"\n  ……还有 {len(self.errors) - 20} 条错误"
+        return text
@@ -0,0 +1,126 @@
+import os
+import copy
+import json
+import queue
+import atexit
+import logging
+import logging.handlers
+
+LOGGER_NAME = 'TaskManager'
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+DATE_FORMAT = '%Y-%m-%d %H:%M:%S'
+
+# 日志轮转：TEMPUS_LOG_ROTATE=size（默认，按大小）或 daily（每天午夜），
+# TEMPUS_LOG_FORMAT=json 时每行输出一个 JSON 对象
+DEFAULT_MAX_BYTES = 1024 * 1024
+DEFAULT_BACKUPS = 5
+
+_queue = queue.SimpleQueue()
+_installed = False
+_listener = None
+_log_file = None
+
+
+class JsonFormatter(logging.Formatter):
+    """每条日志一行 JSON，extra={"event": {...}} 传入的结构化字段放在 event 中"""
+
+    def format(self, record):
+        data = {
+            "time": self.formatTime(record, DATE_FORMAT),
+            "level": record.levelname,
+            "message": record.getMessage(),
+        }
+        event = getattr(record, 'event', None)
+        if event is not None:
+            data["event"] = event
+        # 异常在入队前已由 _QueueHandler 格式化到 exc_text
+        if record.exc_text:
+            data["exception"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False)
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """入队前把异常堆栈格式化到 exc_text，消息本身只保留文字
+
+    标准的 QueueHandler.prepare 把堆栈拼进消息并清掉 exc_info，JsonFormatter 就无法单独输出；
+    这里保留 exc_text，文本格式的输出仍会把它附在消息后面。
+    """
+
+    def prepare(self, record):
+        exc_text = record.exc_text
+        if record.exc_info and not exc_text:
+            exc_text = _exception_formatter.formatException(record.exc_info)
+        record = copy.copy(record)
+        record.message = record.getMessage()
+        record.msg = record.message
+        record.args = None
+        record.exc_info = None
+        record.exc_text = exc_text
+        return record
+
+
+_exception_formatter = logging.Formatter()
+
+
+def _make_formatter():
+    if os.environ.get('TEMPUS_LOG_FORMAT', 'text') == 'json':
+        return JsonFormatter()
+    return logging.Formatter(LOG_FORMAT, datefmt=DATE_FORMAT)
+
+
+def _make_file_handler(log_file):
+    backups = int(os.environ.get('TEMPUS_LOG_BACKUPS', DEFAULT_BACKUPS))
+    if os.environ.get('TEMPUS_LOG_ROTATE', 'size') == 'daily':
+        return logging.handlers.TimedRotatingFileHandler(
+            log_file, when='midnight', backupCount=backups, encoding='utf-8'
+        )
+    return logging.handlers.RotatingFileHandler(
+        log_file, maxBytes=int(os.environ.get('TEMPUS_LOG_MAX_BYTES', DEFAULT_MAX_BYTES)),
+        backupCount=backups, encoding='utf-8'
+    )
+
+
+def setup_logging(log_file):
+    """配置并返回 TaskManager 日志
+
+    logger 上只挂一个 QueueHandler，调用方只把记录放进队列；写文件和控制台由
+    QueueListener 的后台线程完成。多次调用不会重复添加处理器，日志文件不同时切换到新文件。
+    """
+    global _installed, _listener, _log_file
+    logger = logging.getLogger(LOGGER_NAME)
+    if _listener is not None and _log_file == log_file:
+        return logger
+
+    if not _installed:
+        logger.setLevel(logging.INFO)
+        logger.addHandler(_QueueHandler(_queue))
+        atexit.register(stop_logging)
+        _installed = True
+    stop_logging()
+
+    formatter = _make_formatter()
+    file_handler = _make_file_handler(log_file)
+    file_handler.setLevel(logging.INFO)
+    file_handler.setFormatter(formatter)
+    console_handler = logging.StreamHandler()
+    console_handler.setLevel(logging.INFO)
+    console_handler.setFormatter(formatter)
+
+    _listener = logging.handlers.QueueListener(
+        _queue, file_handler, console_handler, respect_handler_level=True
+    )
+    _listener.start()
+    _log_file = log_file
+    return logger
+
+
+def stop_logging():
+    """写完队列中的日志并关闭文件，程序退出时自动调用"""
+    global _listener, _log_file
+    if _listener is None:
+        return
+    _listener.stop()
+    for handler in _listener.handlers:
+        handler.close()
+    _listener = None
+    _log_file = None
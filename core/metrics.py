@@ -0,0 +1,164 @@
+import os
+import json
+import time
+import bisect
+import functools
+import threading
+
+from .storage import write_atomic
+
+# TEMPUS_METRICS=1 时开启。关闭时 timed 直接返回原函数，count / observe 立即返回，
+# 热点路径上没有额外开销
+ENABLED = os.environ.get('TEMPUS_METRICS', '0') == '1'
+
+# 延迟直方图的桶上限（秒），与 Prometheus 的 le 含义相同，最后一个桶为 +Inf
+BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05,
+           0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+LATENCY_METRIC = "tempus_latency_seconds"
+
+_lock = threading.Lock()
+_histograms = {}  # 操作名 -> [各桶计数（最后一个为 +Inf）, 次数, 总秒数]
+_counters = {}    # (指标名, ((标签, 值), ...)) -> 数值
+
+
+def observe(op, seconds):
+    """记录一次 op 的耗时（秒）"""
+    if not ENABLED:
+        return
+    index = bisect.bisect_left(BUCKETS, seconds)
+    with _lock:
+        histogram = _histograms.get(op)
+        if histogram is None:
+            histogram = _histograms[op] = [[0] * (len(BUCKETS) + 1), 0, 0.0]
+        histogram[0][index] += 1
+        histogram[1] += 1
+        histogram[2] += seconds
+
+
+def count(name, n=1, **labels):
+    """计数器加 n，labels 为 Prometheus 标签"""
+    if not ENABLED:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + n
+
+
+def timed(op):
+    """装饰器：记录函数每次调用的耗时；关闭时不包装"""
+    def decorator(func):
+        if not ENABLED:
+            return func
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            started = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                observe(op, time.perf_counter() - started)
+        return wrapper
+    return decorator
+
+
+def quantile(histogram, q):
+    """按桶内线性插值估计分位数（秒），落在 +Inf 桶时返回最后一个桶上限"""
+    buckets, total = histogram["buckets"], histogram["count"]
+    if not total:
+        return 0.0
+    rank = q * total
+    cumulative = 0
+    lower = 0.0
+    for upper, n in zip(BUCKETS, buckets):
+        if n and cumulative + n >= rank:
+            return lower + (upper - lower) * (rank - cumulative) / n
+        cumulative += n
+        lower = upper
+    return BUCKETS[-1]
+
+
+def snapshot():
+    """当前数据的副本：{"histograms": {操作: {...}}, "counters": [{...}]}"""
+    with _lock:
+        histograms = {
+            op: {"buckets": list(buckets), "count": n, "sum": total}
+            for op, (buckets, n, total) in _histograms.items()
+        }
+        counters = [
+            {"name": name, "labels": dict(labels), "value": value}
+            for (name, labels), value in _counters.items()
+        ]
+    return {"histograms": histograms, "counters": counters}
+
+
+def merge(data, other):
+    """把 other 的数据累加到 data 上（两者都是 snapshot 的格式），返回 data"""
+    for op, histogram in other.get("histograms", {}).items():
+        target = data["histograms"].setdefault(
+            op, {"buckets": [0] * (len(BUCKETS) + 1), "count": 0, "sum": 0.0})
+        target["buckets"] = [a + b for a, b in zip(target["buckets"], histogram["buckets"])]
+        target["count"] += histogram["count"]
+        target["sum"] += histogram["sum"]
+    counters = {(c["name"], tuple(sorted(c["labels"].items()))): c for c in data["counters"]}
+    for counter in other.get("counters", []):
+        key = (counter["name"], tuple(sorted(counter["labels"].items())))
+        if key in counters:
+            counters[key]["value"] += counter["value"]
+        else:
+            counters[key] = dict(counter)
+            data["counters"].append(counters[key])
+    return data
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+
+
+def load(path):
+    """读取之前保存的数据，没有文件时返回空数据"""
+    if not os.path.exists(path):
+        return {"histograms": {}, "counters": []}
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def save(path):
+    """把本进程的数据累加到 path 中并清空内存中的数据，程序退出时调用"""
+    if not ENABLED:
+        return
+    data = snapshot()
+    if not data["histograms"] and not data["counters"]:
+        return
+    write_atomic(path, json.dumps(merge(load(path), data), ensure_ascii=False, indent=1))
+    reset()
+
+
+def to_json(data):
+    return json.dumps(data, ensure_ascii=False, indent=4) + "\n"
+
+
+def _labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{key}="{value}"' for key, value in sorted(labels.items())) + "}"
+
+
+def to_prometheus(data):
+    """Prometheus 文本格式"""
+    lines = [f"# TYPE {LATENCY_METRIC} histogram"]
+    for op, histogram in sorted(data["histograms"].items()):
+        cumulative = 0
+        for upper, n in zip(BUCKETS + ("+Inf",), histogram["buckets"]):
+            cumulative += n
+            lines.append(f'{LATENCY_METRIC}_bucket{{op="{op}",le="{upper}"}} {cumulative}')
+        lines.append(f'{LATENCY_METRIC}_sum{{op="{op}"}} {histogram["sum"]}')
+        lines.append(f'{LATENCY_METRIC}_count{{op="{op}"}} {histogram["count"]}')
+    names = sorted({counter["name"] for counter in data["counters"]})
+    for name in names:
+        lines.append(f"# TYPE {name} counter")
+        for counter in data["counters"]:
+            if counter["name"] == name:
+                lines.append(f"{name}{_labels(counter['labels'])} {counter['value']}")
+    return "\n".join(lines) + "\n"
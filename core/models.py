@@ -0,0 +1,138 @@
+from datetime import datetime
+
+
+def parse_time(value):
+    """存储格式 "YYYY-MM-DD HH:MM:SS" -> datetime，空字符串返回 None"""
+    return datetime.fromisoformat(value) if value else None
+
+
+def format_time(value):
+    """datetime -> 存储格式，None 返回空字符串"""
+    return value.isoformat(' ', 'seconds') if value else ""
+
+
+def now():
+    """当前时间，精确到秒，与存储格式一致"""
+    return datetime.now().replace(microsecond=0)
+
+
+class Adjustment:
+    """一次时限调整记录"""
+
+    __slots__ = ('time', 'reason', 'original_deadline', 'new_deadline', 'adjustment_count')
+
+    def __init__(self, time, reason, original_deadline, new_deadline, adjustment_count):
+        self.time = time
+        self.reason = reason
+        self.original_deadline = original_deadline
+        self.new_deadline = new_deadline
+        self.adjustment_count = adjustment_count
+
+    @classmethod
+    def from_dict(cls, data, count=None):
+        return cls(
+            parse_time(data['time']),
+            data.get('reason', ""),
+            parse_time(data['original_deadline']),
+            parse_time(data['new_deadline']),
+            data.get('adjustment_count', count)
+        )
+
+    def to_dict(self):
+        return {
+            "time": format_time(self.time),
+            "reason": self.reason,
+            "original_deadline": format_time(self.original_deadline),
+            "new_deadline": format_time(self.new_deadline),
+            "adjustment_count": self.adjustment_count
+        }
+
+
+class Task:
+    """任务记录，时间字段均为 datetime（未完成时 completion_time 为 None）
+
+    只在存储边界通过 from_dict / to_dict 与 JSON 格式互相转换。
+    """
+
+    __slots__ = (
+        'id', 'task', 'start_time', 'initial_deadline', 'current_deadline',
+        'adjustments', 'completion_time', 'summary', 'status',
+        'total_adjustments', 'total_adjusted_time'
+    )
+
+    def __init__(self, id, task, start_time, initial_deadline, current_deadline,
+                 adjustments=None, completion_time=None, summary="", status="进行中",
+                 total_adjustments=0, total_adjusted_time=0):
+        self.id = id
+        self.task = task
+        self.start_time = start_time
+        self.initial_deadline = initial_deadline
+        self.current_deadline = current_deadline
+        self.adjustments = adjustments if adjustments is not None else []
+        self.completion_time = completion_time
+        self.summary = summary
+        self.status = status
+        self.total_adjustments = total_adjustments
+        self.total_adjusted_time = total_adjusted_time
+
+    @property
+    def date(self):
+        """开始日期 "YYYY-MM-DD"，用于按日期分组"""
+        return self.start_time.date().isoformat()
+
+    @classmethod
+    def from_dict(cls, data):
+        adjustments = [
+            Adjustment.from_dict(adj, count)
+            for count, adj in enumerate(data.get('adjustments', []), start=1)
+        ]
+        return cls(
+            data['id'],
+            data['task'],
+            parse_time(data['start_time']),
+            parse_time(data['initial_deadline']),
+            parse_time(data['current_deadline']),
+            adjustments,
+            parse_time(data.get('completion_time', "")),
+            data.get('summary', ""),
+            data.get('status', "进行中"),
+            data.get('total_adjustments', len(adjustments)),
+            data.get('total_adjusted_time', 0)
+        )
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "task": self.task,
+            "start_time": format_time(self.start_time),
+            "initial_deadline": format_time(self.initial_deadline),
+            "current_deadline": format_time(self.current_deadline),
+            "adjustments": [adj.to_dict() for adj in self.adjustments],
+            "completion_time": format_time(self.completion_time),
+            "summary": self.summary,
+            "status": self.status,
+            "total_adjustments": self.total_adjustments,
+            "total_adjusted_time": self.total_adjusted_time
+        }
+
+
+class Reminder:
+    """一个待触发的快速提醒"""
+
+    __slots__ = ('id', 'time', 'minutes')
+
+    def __init__(self, id, time, minutes):
+        self.id = id
+        self.time = time
+        self.minutes = minutes
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(data['id'], parse_time(data['time']), data['minutes'])
+
+    def to_dict(self):
+        return {
+            "id": self.id,
+            "time": format_time(self.time),
+            "minutes": self.minutes
+        }
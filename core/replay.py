@@ -0,0 +1,59 @@
+from .models import parse_time
+from .storage import apply_event
+
+
+def replay(events):
+    """把事件依次应用到空的状态上，返回 (任务列表, 提醒列表, 事件数)，数据为 JSON 格式的字典
+
+    归档只是把任务移到冷数据，不算删除，重放时跳过，结果中包含已归档的任务。
+    """
+    tasks = []
+    index = {}
+    reminders = {}
+    count = 0
+    for event in events:
+        if event.get('op') != 'archive':
+            apply_event(tasks, index, event, reminders)
+        count += 1
+    return tasks, list(reminders.values()), count
+
+
+def drive(task_manager, events):
+    """把记录的事件当作操作序列，通过 TaskManager 的公开方法重新执行一遍，用作压测负载
+
+    任务 id 由 TaskManager 重新分配，事件中的 id 会映射到新 id；返回各类操作的次数。
+    """
+    ids = {}
+    counts = {}
+    for event in events:
+        op = event.get('op')
+        if op == 'create':
+            task = event['task']
+            ids[task['id']] = task_manager.create_task(
+                task['task'], parse_time(task['current_deadline'])
+            ).id
+        elif op == 'import':
+            # 导入的任务保留原 id
+            task_manager.import_tasks(enumerate(event['tasks'], start=1))
+            ids.update((task['id'], task['id']) for task in event['tasks'])
+        elif op == 'adjust':
+            if event['id'] not in ids:
+                continue
+            adjustment = event['adjustment']
+            task_manager.adjust_task(ids[event['id']], parse_time(adjustment['new_deadline']),
+                                     adjustment['reason'])
+        elif op == 'complete':
+            if event['id'] not in ids:
+                continue
+            task_manager.complete_task(ids[event['id']], event['summary'])
+        elif op == 'status':
+            if event['id'] not in ids:
+                continue
+            task_manager.update_task_status(ids[event['id']], event['status'])
+        elif op == 'add_reminder':
+            task_manager.add_reminder(event['reminder']['minutes'])
+        else:
+            # 归档、移除提醒由程序自动产生，不属于用户操作
+            continue
+        counts[op] = counts.get(op, 0) + 1
+    return counts
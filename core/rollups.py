@@ -0,0 +1,79 @@
+import json
+
+from .storage import write_atomic
+
+ROLLUP_FIELDS = ("created", "completed", "timed_out", "planned_minutes", "adjusted_seconds")
+STATUS_FIELDS = {"已完成": "completed", "已超时": "timed_out"}
+
+
+class DailyRollups:
+    """按开始日期汇总的每日统计：新建、完成、超时的任务数，计划分钟数和调整秒数
+
+    每次修改只更新对应日期的几个计数，O(1)。
+    """
+
+    def __init__(self, days=None):
+        self.days = days if days is not None else {}  # 日期 -> {字段: 数值}
+
+    def _day(self, date):
+        day = self.days.get(date)
+        if day is None:
+            day = self.days[date] = dict.fromkeys(ROLLUP_FIELDS, 0)
+        return day
+
+    def add_task(self, task):
+        day = self._day(task.date)
+        day["created"] += 1
+        field = STATUS_FIELDS.get(task.status)
+        if field:
+            day[field] += 1
+        day["planned_minutes"] += (task.initial_deadline - task.start_time).total_seconds() / 60
+        day["adjusted_seconds"] += task.total_adjusted_time
+
+    def remove_task(self, task):
+        """add_task 的逆操作，任务归档后从热数据的汇总中减去，返回任务的日期"""
+        date = task.date
+        day = self.days.get(date)
+        if day is None:
+            return date
+        day["created"] -= 1
+        field = STATUS_FIELDS.get(task.status)
+        if field:
+            day[field] -= 1
+        day["planned_minutes"] -= (task.initial_deadline - task.start_time).total_seconds() / 60
+        day["adjusted_seconds"] -= task.total_adjusted_time
+        if day["created"] <= 0:
+            del self.days[date]
+        return date
+
+    def change_status(self, date, old_status, new_status):
+        day = self._day(date)
+        if old_status in STATUS_FIELDS:
+            day[STATUS_FIELDS[old_status]] -= 1
+        if new_status in STATUS_FIELDS:
+            day[STATUS_FIELDS[new_status]] += 1
+
+    def add_adjusted(self, date, seconds):
+        self._day(date)["adjusted_seconds"] += seconds
+
+    def get(self, date):
+        return self.days.get(date)
+
+    def merged(self, *others):
+        """与其他汇总逐日相加，返回新的 DailyRollups
+
+        先用 list() 一次复制条目，写入线程调用时界面线程新增日期也不会出错。
+        """
+        days = {date: dict(day) for date, day in list(self.days.items())}
+        for other in others:
+            for date, day in list(other.days.items()):
+                total = days.get(date)
+                if total is None:
+                    days[date] = dict(day)
+                else:
+                    for field in ROLLUP_FIELDS:
+                        total[field] += day[field]
+        return DailyRollups(days)
+
+    def save(self, path):
+        write_atomic(path, json.dumps(dict(sorted(self.days.items())), indent=4))
@@ -0,0 +1,181 @@
+import os
+import re
+import json
+import heapq
+import threading
+
+from .storage import write_atomic
+
+# 中日韩文字按字切分，其余按连续的字母数字切分
+TOKEN_RE = re.compile(r'[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]+|[0-9a-z]+')
+CJK_RE = re.compile(r'[\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uac00-\ud7af\uf900-\ufaff]')
+
+
+def tokenize(text):
+    """中文等按相邻两字（bigram）切分，单独一个字时保留单字；英文数字按整词，统一小写"""
+    tokens = set()
+    for run in TOKEN_RE.findall(text.lower()):
+        if CJK_RE.match(run) and len(run) > 1:
+            tokens.update(run[i:i + 2] for i in range(len(run) - 1))
+        else:
+            tokens.add(run)
+    return tokens
+
+
+def task_text(task):
+    """参与检索的文字：任务描述、总结和所有调整原因"""
+    parts = [task.task, task.summary]
+    parts.extend(adjustment.reason for adjustment in task.adjustments)
+    return "\n".join(part for part in parts if part)
+
+
+class SearchIndex:
+    """任务全文检索的倒排索引
+
+    词 -> 任务 id 集合。任务只会增加文字（调整原因、总结），所以更新时只需把新词并入。
+    除热数据外也包含已归档的任务，每个任务记下日期，方便按日期到归档里取回。
+    docs 里还记录调整次数和是否有总结，启动时与任务比对，补上未保存进索引的修改。
+
+    保存分两部分：完整索引 search_index.json 和追加写的增量 search_index.delta，
+    每次保存只追加本次加入的任务。增量超过 COMPACT_THRESHOLD 行时，由写入线程
+    从两个文件合并出新的完整索引，不读内存中的索引，也不占用 lock。
+    """
+
+    COMPACT_THRESHOLD = 5000
+
+    def __init__(self, data_dir):
+        self.index_file = os.path.join(data_dir, "search_index.json")
+        self.delta_file = os.path.join(data_dir, "search_index.delta")
+        self.lock = threading.Lock()
+        self.postings = {}  # 词 -> {任务 id}
+        self.docs = {}      # 任务 id -> [日期, 调整次数, 是否有总结]
+        self.archived = {}  # 归档时索引尚未读取的任务 id -> 日期，读取后需要到归档里补上
+        self.delta_size = 0
+        self._unsaved = []  # 尚未追加到增量文件的 [任务 id, 日期, 调整次数, 是否有总结, 词]
+
+    def load(self):
+        """读取完整索引和增量，都没有（或增量中只有归档标记）时返回 False"""
+        loaded = False
+        if os.path.exists(self.index_file):
+            with open(self.index_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.docs = data['docs']
+            self.postings = {token: set(ids) for token, ids in data['postings'].items()}
+            loaded = True
+        self.delta_size = 0
+        if os.path.exists(self.delta_file):
+            with open(self.delta_file, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except ValueError:
+                        # 写入中断留下的半行
+                        continue
+                    self.delta_size += 1
+                    if entry[0] == "archived":
+                        self.archived[entry[1]] = entry[2]
+                        continue
+                    task_id, date, adjustments, has_summary, tokens = entry
+                    for token in tokens:
+                        self.postings.setdefault(token, set()).add(task_id)
+                    self.docs[task_id] = [date, adjustments, has_summary]
+                    self.archived.pop(task_id, None)
+                    loaded = True
+        return loaded
+
+    def save(self):
+        """把上次保存之后加入的任务追加到增量文件，由后台写入线程调用"""
+        with self.lock:
+            entries, self._unsaved = self._unsaved, []
+        if not entries:
+            return
+        try:
+            self._append(entries)
+        except Exception:
+            with self.lock:
+                self._unsaved = entries + self._unsaved
+            raise
+        self.delta_size += len(entries)
+        if self.delta_size > self.COMPACT_THRESHOLD:
+            self.compact()
+
+    def compact(self):
+        """从磁盘上的完整索引和增量合并出新的完整索引，清空增量"""
+        merged = SearchIndex(os.path.dirname(self.index_file))
+        merged.load()
+        text = json.dumps({
+            "docs": merged.docs,
+            "postings": {token: list(ids) for token, ids in merged.postings.items()}
+        }, ensure_ascii=False, separators=(',', ':'))
+        write_atomic(self.index_file, text)
+        # 还没补上的归档标记留在新的增量里
+        write_atomic(self.delta_file, "".join(
+            json.dumps(["archived", task_id, date], ensure_ascii=False) + "\n"
+            for task_id, date in merged.archived.items()
+        ))
+        self.delta_size = len(merged.archived)
+
+    def _append(self, entries):
+        with open(self.delta_file, 'a', encoding='utf-8') as f:
+            f.write("".join(json.dumps(entry, ensure_ascii=False) + "\n" for entry in entries))
+
+    @staticmethod
+    def mark_archived(data_dir, tasks):
+        """索引未读取时归档了任务：索引已存在时追加归档标记，下次读取索引时补上这些任务
+
+        tasks 为 [(任务 id, 日期)]，由后台写入线程调用；索引还不存在时不用标记，建立时会读取全部归档。
+        """
+        index = SearchIndex(data_dir)
+        if not os.path.exists(index.index_file) and not os.path.exists(index.delta_file):
+            return
+        index._append([["archived", task_id, date] for task_id, date in tasks])
+
+    def is_current(self, task):
+        """索引中的内容是否已包含任务的全部文字"""
+        return self.docs.get(task.id) == [task.date, len(task.adjustments), bool(task.summary)]
+
+    def add(self, task):
+        """加入或更新一个任务，重复加入没有副作用"""
+        tokens = tokenize(task_text(task))
+        doc = [task.date, len(task.adjustments), bool(task.summary)]
+        with self.lock:
+            for token in tokens:
+                ids = self.postings.get(token)
+                if ids is None:
+                    ids = self.postings[token] = set()
+                ids.add(task.id)
+            self.docs[task.id] = doc
+            self.archived.pop(task.id, None)
+            self._unsaved.append([task.id] + doc + [sorted(tokens)])
+
+    def search(self, query, limit=None):
+        """返回同时包含查询中所有词的任务 [(任务 id, 日期)]，按日期从新到旧"""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        with self.lock:
+            matches = []
+            for token in tokens:
+                ids = self.postings.get(token)
+                if ids is None and len(token) == 1 and CJK_RE.match(token):
+                    # 单个汉字不在索引里（汉字按两字切分），改为合并所有含这个字的词；
+                    # 英文数字按整词索引，单个字母不做子串匹配
+                    ids = set()
+                    for key, key_ids in self.postings.items():
+                        if token in key:
+                            ids |= key_ids
+                if not ids:
+                    return []
+                matches.append(ids)
+            matches.sort(key=len)
+            result = set(matches[0])
+            for ids in matches[1:]:
+                result &= ids
+                if not result:
+                    return []
+            keyed = ((self.docs[task_id][0], task_id) for task_id in result)
+            if limit is None:
+                found = sorted(keyed, reverse=True)
+            else:
+                found = heapq.nlargest(limit, keyed)
+        return [(task_id, date) for date, task_id in found]
@@ -0,0 +1,234 @@
+import os
+import sqlite3
+import logging
+import threading
+
+from .storage import JournalStorage
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY,
+    task TEXT NOT NULL,
+    start_time TEXT NOT NULL,
+    initial_deadline TEXT NOT NULL,
+    current_deadline TEXT NOT NULL,
+    completion_time TEXT NOT NULL DEFAULT '',
+    summary TEXT NOT NULL DEFAULT '',
+    status TEXT NOT NULL,
+    total_adjustments INTEGER NOT NULL DEFAULT 0,
+    total_adjusted_time REAL NOT NULL DEFAULT 0
+);
+CREATE TABLE IF NOT EXISTS adjustments (
+    task_id TEXT NOT NULL,
+    adjustment_count INTEGER NOT NULL,
+    time TEXT NOT NULL,
+    reason TEXT NOT NULL,
+    original_deadline TEXT NOT NULL,
+    new_deadline TEXT NOT NULL,
+    PRIMARY KEY (task_id, adjustment_count)
+);
+CREATE TABLE IF NOT EXISTS reminders (
+    id TEXT PRIMARY KEY,
+    time TEXT NOT NULL,
+    minutes INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_start_time ON tasks (start_time);
+-- 查询都在 TaskManager 的内存索引上完成，按状态、截止时间的索引只增加写入开销，旧数据库中删掉
+DROP INDEX IF EXISTS idx_tasks_status;
+DROP INDEX IF EXISTS idx_tasks_current_deadline;
+CREATE INDEX IF NOT EXISTS idx_reminders_time ON reminders (time);
+"""
+
+TASK_COLUMNS = (
+    "id", "task", "start_time", "initial_deadline", "current_deadline",
+    "completion_time", "summary", "status", "total_adjustments", "total_adjusted_time"
+)
+
+UPSERT_TASK = f"""
+INSERT INTO tasks ({", ".join(TASK_COLUMNS)})
+VALUES ({", ".join("?" for _ in TASK_COLUMNS)})
+ON CONFLICT(id) DO UPDATE SET
+    {", ".join(f"{c} = excluded.{c}" for c in TASK_COLUMNS[1:])}
+"""
+
+UPSERT_ADJUSTMENT = """
+INSERT OR REPLACE INTO adjustments
+    (task_id, adjustment_count, time, reason, original_deadline, new_deadline)
+VALUES (?, ?, ?, ?, ?, ?)
+"""
+
+SELECT_TASKS = f"SELECT {', '.join(TASK_COLUMNS)} FROM tasks"
+
+
+class SQLiteStorage:
+    """SQLite 任务存储
+
+    任务和调整记录分表保存，主键即 id 索引，start_time 上的索引用于加载时按时间排序。
+    每次修改都是一个事务内的按行 upsert，不需要像快照那样重写全部任务。
+    查询由 TaskManager 在内存中的索引上完成。
+    """
+
+    def __init__(self, data_dir):
+        self.data_dir = data_dir
+        self.db_file = os.path.join(data_dir, "tasks.db")
+        self.logger = logging.getLogger('TaskManager')
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(self.db_file, check_same_thread=False)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.executescript(SCHEMA)
+
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+    # ---- 与 JournalStorage 相同的存储接口 ----
+
+    def load(self, read_only=False):
+        """返回 (任务列表, 待触发的提醒列表)；read_only 与 JournalStorage 相同，SQLite 读取本身不修改数据"""
+        self._migrate_from_json()
+        with self.lock:
+            rows = self.conn.execute(SELECT_TASKS + " ORDER BY start_time, rowid").fetchall()
+            adjustments = self._adjustments()
+            reminders = [
+                {"id": reminder_id, "time": time, "minutes": minutes}
+                for reminder_id, time, minutes in self.conn.execute(
+                    "SELECT id, time, minutes FROM reminders ORDER BY time"
+                )
+            ]
+        return [self._row_to_task(row, adjustments.get(row[0], [])) for row in rows], reminders
+
+    def append(self, events):
+        """在一个事务里应用一批事件"""
+        with self.lock, self.conn:
+            for event in events:
+                self._apply_event(event)
+
+    def needs_compaction(self):
+        return False
+
+    def compact(self):
+        pass
+
+    def save(self, tasks, reminders):
+        """在一个事务里 upsert 全部任务（不会删除列表之外的行），并替换提醒表"""
+        with self.lock, self.conn:
+            for task in tasks:
+                self._upsert_task(task)
+            self._replace_reminders(reminders)
+
+    # ---- 内部方法 ----
+
+    def _migrate_from_json(self):
+        """首次启动时导入已有的 tasks.json（及未合并的日志）"""
+        with self.lock:
+            migrated = self.conn.execute(
+                "SELECT value FROM meta WHERE key = 'migrated_from_json'"
+            ).fetchone()
+        if migrated:
+            return
+
+        legacy = JournalStorage(self.data_dir)
+        tasks, reminders = [], []
+        if os.path.exists(legacy.snapshot_file) or os.path.exists(legacy.journal_file):
+            tasks, reminders = legacy.load()
+        with self.lock, self.conn:
+            for task in tasks:
+                self._upsert_task(task)
+            self._replace_reminders(reminders)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('migrated_from_json', ?)",
+                (str(len(tasks)),)
+            )
+        if tasks:
+            self.logger.info(f"已从 tasks.json 导入 {len(tasks)} 个任务到 SQLite")
+
+    def _apply_event(self, event):
+        op = event.get('op')
+        if op == 'add_reminder':
+            reminder = event['reminder']
+            self.conn.execute(
+                "INSERT OR REPLACE INTO reminders (id, time, minutes) VALUES (?, ?, ?)",
+                (reminder['id'], reminder['time'], reminder['minutes'])
+            )
+        elif op == 'remove_reminders':
+            self.conn.executemany(
+                "DELETE FROM reminders WHERE id = ?",
+                [(reminder_id,) for reminder_id in event['ids']]
+            )
+        elif op == 'archive':
+            rows = [(task_id,) for task_id in event['ids']]
+            self.conn.executemany("DELETE FROM tasks WHERE id = ?", rows)
+            self.conn.executemany("DELETE FROM adjustments WHERE task_id = ?", rows)
+        elif op == 'create':
+            self._upsert_task(event['task'])
+        elif op == 'import':
+            for task in event['tasks']:
+                self._upsert_task(task)
+        elif op == 'adjust':
+            adjustment = event['adjustment']
+            self._upsert_adjustment(event['id'], adjustment)
+            self.conn.execute(
+                "UPDATE tasks SET current_deadline = ?, total_adjustments = ?, "
+                "total_adjusted_time = ? WHERE id = ?",
+                (adjustment['new_deadline'], adjustment['adjustment_count'],
+                 event['total_adjusted_time'], event['id'])
+            )
+        elif op == 'complete':
+            self.conn.execute(
+                "UPDATE tasks SET completion_time = ?, summary = ?, status = ? WHERE id = ?",
+                (event['completion_time'], event['summary'], "已完成", event['id'])
+            )
+        elif op == 'status':
+            self.conn.execute(
+                "UPDATE tasks SET status = ? WHERE id = ?",
+                (event['status'], event['id'])
+            )
+
+    def _replace_reminders(self, reminders):
+        self.conn.execute("DELETE FROM reminders")
+        self.conn.executemany(
+            "INSERT INTO reminders (id, time, minutes) VALUES (?, ?, ?)",
+            [(r['id'], r['time'], r['minutes']) for r in reminders]
+        )
+
+    def _upsert_task(self, task):
+        self.conn.execute(UPSERT_TASK, (
+            task['id'], task['task'], task['start_time'], task['initial_deadline'],
+            task['current_deadline'], task.get('completion_time', ''), task.get('summary', ''),
+            task['status'], task.get('total_adjustments', len(task['adjustments'])),
+            task.get('total_adjusted_time', 0)
+        ))
+        for count, adjustment in enumerate(task['adjustments'], start=1):
+            self._upsert_adjustment(task['id'], dict(adjustment, adjustment_count=count))
+
+    def _upsert_adjustment(self, task_id, adjustment):
+        self.conn.execute(UPSERT_ADJUSTMENT, (
+            task_id, adjustment['adjustment_count'], adjustment['time'],
+            adjustment['reason'], adjustment['original_deadline'], adjustment['new_deadline']
+        ))
+
+    def _adjustments(self):
+        """查询全部调整记录，返回 任务 id -> 调整列表；需在持有锁时调用"""
+        sql = ("SELECT task_id, adjustment_count, time, reason, original_deadline, new_deadline "
+               "FROM adjustments ORDER BY task_id, adjustment_count")
+        result = {}
+        for task_id, count, time, reason, original, new in self.conn.execute(sql):
+            result.setdefault(task_id, []).append({
+                "time": time,
+                "reason": reason,
+                "original_deadline": original,
+                "new_deadline": new,
+                "adjustment_count": count
+            })
+        return result
+
+    def _row_to_task(self, row, adjustments):
+        task = dict(zip(TASK_COLUMNS, row))
+        task['adjustments'] = adjustments
+        return task
@@ -0,0 +1,164 @@
+from datetime import datetime
+
+# numpy 只在第一次统计时导入，不影响程序启动速度
+
+EPOCH = datetime(1970, 1, 1)  # 本地时间按原样换算成秒，星期和小时不受时区影响
+STATUS_CODES = {"进行中": 0, "已完成": 1, "已超时": 2}
+WEEKDAYS = ["周一", "周二", "周三", "周四", "周五", "周六", "周日"]
+# 完成时间相对初始截止时间的分段（秒）
+OVERRUN_BINS = [0, 15 * 60, 60 * 60, 4 * 60 * 60]
+OVERRUN_LABELS = ["按时完成", "超出 15 分钟内", "超出 15-60 分钟", "超出 1-4 小时", "超出 4 小时以上"]
+
+
+def _seconds(dt):
+    return (dt - EPOCH).total_seconds() if dt else float('nan')
+
+
+def _day_seconds(date):
+    """"YYYY-MM-DD" 当天零点的秒数"""
+    return _seconds(datetime.strptime(date, '%Y-%m-%d'))
+
+
+# 列名和 numpy 类型，顺序与 _row 一致
+COLUMNS = (("start", "float64"), ("initial_deadline", "float64"), ("deadline", "float64"),
+           ("completion", "float64"), ("adjustments", "int32"), ("adjusted_time", "float64"),
+           ("status", "int8"))
+
+
+def _row(task):
+    return (_seconds(task.start_time), _seconds(task.initial_deadline), _seconds(task.current_deadline),
+            _seconds(task.completion_time), task.total_adjustments, task.total_adjusted_time,
+            STATUS_CODES.get(task.status, 3))
+
+
+class TaskColumns:
+    """按列存放的任务数据，每一列是一个 numpy 数组，时间为秒，未完成的完成时间为 NaN
+
+    传入 arrays 时直接使用这些数组（顺序同 COLUMNS），不再遍历任务。
+    """
+
+    def __init__(self, tasks=(), arrays=None):
+        import numpy as np
+        if arrays is None:
+            # 一次遍历取出每个任务的一行，再由 numpy 拆成各列
+            rows = np.array([_row(task) for task in tasks], np.float64).reshape(-1, len(COLUMNS))
+            arrays = [rows[:, i].astype(dtype) for i, (_, dtype) in enumerate(COLUMNS)]
+        for (name, _), array in zip(COLUMNS, arrays):
+            setattr(self, name, array)
+
+    def __len__(self):
+        return len(self.start)
+
+    @classmethod
+    def concat(cls, parts):
+        import numpy as np
+        return cls(arrays=[np.concatenate([getattr(part, name) for part in parts]) for name, _ in COLUMNS])
+
+
+class ColumnCache:
+    """可增量更新的列数据，TaskManager 用它缓存热数据，统计时只按日期范围取出需要的行
+
+    与每日汇总一样随修改维护：新建追加一行，调整、完成、状态变化只改写该任务的一行，
+    数组满了按两倍扩容。移除的行把开始时间置为 NaN，不会落入任何日期范围，
+    超过一半的行被移除时再压缩。
+    """
+
+    def __init__(self, tasks=()):
+        tasks = list(tasks)
+        columns = TaskColumns(tasks)
+        self._arrays = [getattr(columns, name) for name, _ in COLUMNS]
+        self._rows = {task.id: i for i, task in enumerate(tasks)}  # 任务 id -> 行号
+        self._size = len(tasks)  # 已使用的行数，包括移除的行
+
+    def __len__(self):
+        return len(self._rows)
+
+    def add(self, task):
+        if self._size == len(self._arrays[0]):
+            self._resize(max(16, 2 * self._size))
+        self._rows[task.id] = self._size
+        self._size += 1
+        self.update(task)
+
+    def update(self, task):
+        """任务的字段变化后改写它的那一行"""
+        row = self._rows.get(task.id)
+        if row is None:
+            return
+        for array, value in zip(self._arrays, _row(task)):
+            array[row] = value
+
+    def remove(self, tasks):
+        for task in tasks:
+            row = self._rows.pop(task.id, None)
+            if row is not None:
+                self._arrays[0][row] = float('nan')
+        if len(self._rows) < self._size // 2:
+            self._compact()
+
+    def select(self, start_date=None, end_date=None):
+        """开始日期在范围内（"YYYY-MM-DD"，包含两端）的行，返回 TaskColumns"""
+        import numpy as np
+        start = self._arrays[0][:self._size]
+        mask = ~np.isnan(start)
+        if start_date:
+            mask &= start >= _day_seconds(start_date)
+        if end_date:
+            mask &= start < _day_seconds(end_date) + 86400
+        return TaskColumns(arrays=[array[:self._size][mask] for array in self._arrays])
+
+    def _resize(self, capacity):
+        import numpy as np
+        for i, array in enumerate(self._arrays):
+            resized = np.empty(capacity, array.dtype)
+            resized[:self._size] = array[:self._size]
+            self._arrays[i] = resized
+
+    def _compact(self):
+        import numpy as np
+        keep = ~np.isnan(self._arrays[0][:self._size])
+        new_rows = np.cumsum(keep) - 1
+        self._arrays = [array[:self._size][keep] for array in self._arrays]
+        self._rows = {task_id: int(new_rows[row]) for task_id, row in self._rows.items()}
+        self._size = len(self._arrays[0])
+
+
+def compute_stats(columns):
+    """在列数据上计算统计结果，全部是数组运算，返回普通的 Python 数据"""
+    import numpy as np
+    total = len(columns)
+    completed = columns.status == 1
+    timed_out = columns.status == 2
+    finished = int(completed.sum() + timed_out.sum())
+
+    # 超时分布：完成时间相对初始截止时间。旧数据或手动改状态的任务可能已完成但没有完成时间，
+    # 只统计有完成时间的
+    has_completion = completed & ~np.isnan(columns.completion)
+    overrun = columns.completion[has_completion] - columns.initial_deadline[has_completion]
+    overrun_counts = np.bincount(np.searchsorted(OVERRUN_BINS, overrun, side='left'),
+                                 minlength=len(OVERRUN_LABELS))
+
+    # 按完成时间统计每个星期几、每个小时完成的任务数（1970-01-01 是周四）
+    done_at = columns.completion[has_completion]
+    days = np.floor_divide(done_at, 86400)
+    by_weekday = np.bincount(((days + 3) % 7).astype(np.int64), minlength=7)
+    by_hour = np.bincount((np.floor_divide(done_at - days * 86400, 3600)).astype(np.int64), minlength=24)
+
+    slippage = columns.deadline - columns.initial_deadline
+    adjusted = columns.adjustments > 0
+    return {
+        "total": total,
+        "completed": int(completed.sum()),
+        "timed_out": int(timed_out.sum()),
+        "in_progress": int((columns.status == 0).sum()),
+        "completion_rate": float(completed.sum()) / finished if finished else 0.0,
+        "overrun": dict(zip(OVERRUN_LABELS, overrun_counts.tolist())),
+        "median_overrun": float(np.median(overrun)) if len(overrun) else 0.0,
+        "avg_slippage": float(slippage.mean()) if total else 0.0,
+        "avg_adjusted_slippage": float(slippage[adjusted].mean()) if adjusted.any() else 0.0,
+        "avg_adjustments": float(columns.adjustments.mean()) if total else 0.0,
+        "adjusted_ratio": float(adjusted.mean()) if total else 0.0,
+        "by_weekday": dict(zip(WEEKDAYS, by_weekday.tolist())),
+        "by_hour": by_hour.tolist(),
+    }
+
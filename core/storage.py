@@ -0,0 +1,190 @@
+import os
+import json
+
+
+def apply_event(tasks, index, event, reminders=None):
+    """把一条日志事件应用到任务列表（及提醒字典）上，重复应用同一事件不会产生副作用"""
+    op = event.get('op')
+    if op == 'add_reminder':
+        if reminders is not None:
+            reminders[event['reminder']['id']] = event['reminder']
+        return
+    if op == 'remove_reminders':
+        if reminders is not None:
+            for reminder_id in event['ids']:
+                reminders.pop(reminder_id, None)
+        return
+    if op == 'archive':
+        # 已移入归档分片的任务从热数据中删除
+        ids = set(event['ids'])
+        tasks[:] = [task for task in tasks if task['id'] not in ids]
+        for task_id in ids:
+            index.pop(task_id, None)
+        return
+    if op == 'create':
+        _upsert_task(tasks, index, event['task'])
+        return
+    if op == 'import':
+        # 批量导入的任务在同一条事件里，整批要么全部生效要么全部丢弃
+        for task in event['tasks']:
+            _upsert_task(tasks, index, task)
+        return
+
+    task = index.get(event.get('id'))
+    if task is None:
+        return
+
+    if op == 'adjust':
+        adjustment = event['adjustment']
+        # adjustment_count 即该调整在列表中的序号，用来跳过已经写进快照的调整
+        if len(task['adjustments']) < adjustment['adjustment_count']:
+            task['adjustments'].append(adjustment)
+            task['current_deadline'] = adjustment['new_deadline']
+            task['total_adjustments'] = len(task['adjustments'])
+            task['total_adjusted_time'] = event['total_adjusted_time']
+    elif op == 'complete':
+        task['completion_time'] = event['completion_time']
+        task['summary'] = event['summary']
+        task['status'] = "已完成"
+    elif op == 'status':
+        task['status'] = event['status']
+
+
+def _upsert_task(tasks, index, task):
+    existing = index.get(task['id'])
+    if existing is None:
+        tasks.append(task)
+    else:
+        existing.clear()
+        existing.update(task)
+        task = existing
+    index[task['id']] = task
+
+
+def write_atomic(path, data):
+    """先写临时文件并 fsync，再原子替换目标文件；data 可以是 str 或 bytes"""
+    temp_file = path + '.tmp'
+    if isinstance(data, bytes):
+        f = open(temp_file, 'wb')
+    else:
+        f = open(temp_file, 'w', encoding='utf-8')
+    with f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(temp_file, path)
+    if hasattr(os, 'O_DIRECTORY'):
+        # 让 rename 本身也落盘（Windows 不支持对目录 fsync）
+        dir_fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+
+def create_storage(kind, data_dir):
+    """按名称创建存储后端：journal（默认）或 sqlite"""
+    if kind == 'sqlite':
+        from .sqlite_storage import SQLiteStorage
+        return SQLiteStorage(data_dir)
+    if kind in (None, '', 'journal'):
+        return JournalStorage(data_dir)
+    raise ValueError(f"未知的存储类型: {kind}")
+
+
+class JournalStorage:
+    """快照 + 追加日志的任务存储
+
+    每次修改只向 tasks.journal 追加一行 JSON 事件，加载时先读快照再重放日志，
+    日志累积到一定条数后由 compact() 合并成新的快照。
+    """
+
+    def __init__(self, data_dir, compact_threshold=500):
+        self.snapshot_file = os.path.join(data_dir, "tasks.json")
+        self.reminder_file = os.path.join(data_dir, "reminders.json")
+        self.journal_file = os.path.join(data_dir, "tasks.journal")
+        self.compact_threshold = compact_threshold
+        self.compact_requested = False  # 批量导入后尽快合并成快照
+        self.journal_size = 0  # 日志中尚未合并的事件条数
+
+    def load(self, read_only=False):
+        """返回 (任务列表, 待触发的提醒列表)
+
+        read_only 时不截掉日志末尾的半行：其他进程（比如正在运行的图形界面）可能正在追加，
+        只有拥有数据的进程才修复日志。
+        """
+        tasks = []
+        if os.path.exists(self.snapshot_file):
+            with open(self.snapshot_file, 'r', encoding='utf-8') as f:
+                tasks = json.load(f)
+        index = {task['id']: task for task in tasks}
+        reminders = {}
+        if os.path.exists(self.reminder_file):
+            with open(self.reminder_file, 'r', encoding='utf-8') as f:
+                reminders = {reminder['id']: reminder for reminder in json.load(f)}
+
+        self.journal_size = 0
+        self.compact_requested = False
+        archived = False
+        if os.path.exists(self.journal_file):
+            valid_end = 0
+            with open(self.journal_file, 'rb') as f:
+                for line in f:
+                    if line.strip():
+                        try:
+                            event = json.loads(line.decode('utf-8'))
+                        except ValueError:
+                            # 写入中断留下的半行，丢弃它及之后的内容
+                            break
+                        if event.get('op') == 'archive':
+                            # 归档分批进行，日志里可能有几百条归档事件，每条都重建任务列表太慢：
+                            # 这里只从索引中去掉，读完日志后再一次过滤列表
+                            for task_id in event['ids']:
+                                index.pop(task_id, None)
+                            archived = True
+                        else:
+                            apply_event(tasks, index, event, reminders)
+                        self.journal_size += 1
+                    valid_end += len(line)
+            if not read_only and valid_end < os.path.getsize(self.journal_file):
+                with open(self.journal_file, 'r+b') as f:
+                    f.truncate(valid_end)
+        if archived:
+            # 归档后又以同一 id 导入的任务是新的字典，索引指向的才是仍然有效的那个
+            tasks = [task for task in tasks if index.get(task['id']) is task]
+        return tasks, list(reminders.values())
+
+    def append(self, events):
+        """把一批事件一次性追加到日志"""
+        lines = "".join(
+            json.dumps(event, ensure_ascii=False, separators=(',', ':')) + '\n'
+            for event in events
+        )
+        with open(self.journal_file, 'a', encoding='utf-8') as f:
+            f.write(lines)
+            f.flush()
+            os.fsync(f.fileno())
+        self.journal_size += len(events)
+        # 归档是分批进行的，每批都合并会反复重写整个快照，留给日志条数触发
+        if any(event.get('op') == 'import' for event in events):
+            self.compact_requested = True
+
+    def close(self):
+        pass
+
+    def needs_compaction(self):
+        return self.compact_requested or self.journal_size >= self.compact_threshold
+
+    def compact(self):
+        """从磁盘上的快照和日志重建新快照，不依赖内存中的任务列表"""
+        self.save(*self.load())
+
+    def save(self, tasks, reminders):
+        # 快照原子替换；日志事件可重复应用，
+        # 所以即使在替换和清空日志之间中断也不会重复计入
+        write_atomic(self.snapshot_file, json.dumps(tasks, indent=4, ensure_ascii=False))
+        write_atomic(self.reminder_file, json.dumps(reminders, indent=4, ensure_ascii=False))
+        with open(self.journal_file, 'w', encoding='utf-8'):
+            pass
+        self.journal_size = 0
+        self.compact_requested = False
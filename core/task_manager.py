@@ -1,212 +1,759 @@
 import os
-import json
 import uuid
-from datetime import datetime, timedelta
-import logging
+from datetime import timedelta
 import sys
+import bisect
+import time
+import threading
+from collections import OrderedDict
+
+from .models import Task, Adjustment, Reminder, now, format_time
+from .storage import create_storage
+from .archive import ArchiveStore
+from .rollups import DailyRollups, ROLLUP_FIELDS
+from .writer import BackgroundWriter
+from .event_log import EventLog
+from . import metrics
+from .logging_setup import setup_logging
+
+# 检索、导入导出、统计模块在用到时才导入，命令行工具只做简单操作时启动更快
+
+# 结束后超过这么多天的任务会被移到按月归档的分片里，可用 TEMPUS_ARCHIVE_DAYS 修改
+DEFAULT_ARCHIVE_DAYS = 90
+
 
 class TaskManager:
-    def __init__(self):
-        # 获取应用根目录
-        if getattr(sys, 'frozen', False):
-            # 如果是打包后的可执行文件
-            app_root = os.path.dirname(sys.executable)
-        else:
-            # 如果是开发环境
-            app_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-        
+    ARCHIVED_MONTH_CACHE = 24  # 内存中最多保留的已读取归档月份
+    FLUSH_TIMEOUT = 10         # 重新加载前等待后台写入的最长秒数
+
+    def __init__(self, data_dir=None, storage=None, read_only=False):
+        if data_dir is None:
+            # 获取应用根目录
+            if getattr(sys, 'frozen', False):
+                # 如果是打包后的可执行文件
+                app_root = os.path.dirname(sys.executable)
+            else:
+                # 如果是开发环境
+                app_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+            data_dir = os.path.join(app_root, "data")
+
         # 设置数据目录
-        self.data_dir = os.path.join(app_root, "data")
+        self.data_dir = data_dir
         os.makedirs(self.data_dir, exist_ok=True)
         
         # 设置日志
         log_file = os.path.join(self.data_dir, 'task_manager.log')
         self.setup_logger(log_file)
         
-        # 设置任务文件
-        self.task_file = os.path.join(self.data_dir, "tasks.json")
+        # 设置任务存储：可传入存储对象或名称，默认读取 TEMPUS_STORAGE 环境变量，
+        # journal 为快照 tasks.json + 追加日志 tasks.journal，sqlite 为 tasks.db
+        if storage is None or isinstance(storage, str):
+            storage = create_storage(storage or os.environ.get('TEMPUS_STORAGE', 'journal'), self.data_dir)
+        self.storage = storage
+        # 只读：只查询不修改（命令行的 list、stats 等），加载时不修复日志、不写汇总、索引和事件起点，
+        # 图形界面运行时也可以随时调用
+        self.read_only = read_only
         self.tasks = []
+        self._tasks_by_id = {}      # 任务 id -> 任务
+        self._tasks_by_status = {}  # 状态 -> {任务 id: 任务}，保持创建顺序
+        self._tasks_by_date = {}    # 日期 -> 当天的任务列表，保持创建顺序
+        self._dates = []            # 有任务的日期，升序
+        self._rollups = DailyRollups()  # 热数据的每日汇总，归档部分在 manifest 中
+        self._archived_rollups = None
+        # 统计用的列数据在第一次统计时才建立（需要 numpy），之后随修改增量更新
+        self._columns = None
+        self._archived_columns = {}  # 月份 -> 该月归档任务的 TaskColumns
+        self.rollup_file = os.path.join(self.data_dir, "rollups.json")
+        self._rollup_save_pending = False
+        # TEMPUS_METRICS=1 时记录的耗时和计数，退出时累加到这个文件，见 core.metrics
+        self.metrics_file = os.path.join(self.data_dir, "metrics.json")
+        self.reminders = {}         # 提醒 id -> 尚未触发的提醒
+        # 冷数据：启动时只读 manifest，查看对应日期时才读取分片
+        self.archive = ArchiveStore(self.data_dir)
+        self._archived_months = OrderedDict()  # 月份 -> {日期: 任务列表}，最近使用的在后
+        self._all_dates = None                 # 热数据与归档日期合并后的缓存
+        # 全文检索索引在第一次搜索时才读取，之前的修改在读取时按任务比对补上
+        self._search = None
+        self._search_save_pending = False
+        self._search_loader = None    # 后台读取索引的线程，见 preload_search_index
+        self._search_loaded = None    # 后台读取的结果 (索引, 是否有改动)
+        self._search_archived = []    # 后台读取期间归档的任务，接手索引时补上
+        # 所有修改另外永久追加到 events/ 下的事件流，可重放出任意时刻的状态（见 core.replay），
+        # TEMPUS_EVENT_LOG=0 时关闭
+        self.event_log = None
+        if os.environ.get('TEMPUS_EVENT_LOG', '1') != '0':
+            self.event_log = EventLog(self.data_dir)
+        # 写入在后台线程中合并完成，界面线程不等待磁盘
+        self.writer = BackgroundWriter(self.storage, self.logger, event_log=self.event_log)
         self.load_tasks()
+        if self.event_log is not None and not self.read_only and not self.event_log.exists():
+            self._record_baseline()
 
     def setup_logger(self, log_file):
-        # 创建logger
-        logger = logging.getLogger('TaskManager')
-        logger.setLevel(logging.INFO)
-        
-        # 创建文件处理器
-        file_handler = logging.FileHandler(log_file, encoding='utf-8')
-        file_handler.setLevel(logging.INFO)
-        
-        # 创建控制台处理器
-        console_handler = logging.StreamHandler()
-        console_handler.setLevel(logging.INFO)
-        
-        # 创建格式器
-        formatter = logging.Formatter(
-            '%(asctime)s - %(levelname)s - %(message)s',
-            datefmt='%Y-%m-%d %H:%M:%S'
-        )
-        
-        # 设置格式器
-        file_handler.setFormatter(formatter)
-        console_handler.setFormatter(formatter)
-        
-        # 添加处理器
-        logger.addHandler(file_handler)
-        logger.addHandler(console_handler)
-        
-        # 保存logger引用
-        self.logger = logger
+        # 处理器全局只安装一次，写文件在后台线程完成，见 core.logging_setup
+        self.logger = setup_logging(log_file)
 
+    @metrics.timed("load_tasks")
     def load_tasks(self):
-        if os.path.exists(self.task_file):
-            try:
-                with open(self.task_file, 'r', encoding='utf-8') as f:
-                    self.tasks = json.load(f)
-            except Exception as e:
-                self.logger.error(f"加载任务失败: {str(e)}")
-                self.tasks = []
-        else:
+        # 先把排队中的修改写下去，再从存储读取；磁盘出错时不无限等待
+        if not self.writer.flush(self.FLUSH_TIMEOUT):
+            self.logger.error("加载前仍有任务数据未写入，读取的可能不是最新数据")
+        try:
+            # 存储层使用 JSON 格式的字典，在这里统一转换成 Task / Reminder
+            tasks, reminders = self.storage.load(read_only=self.read_only)
+            self.tasks = [Task.from_dict(data) for data in tasks]
+            self.reminders = {data['id']: Reminder.from_dict(data) for data in reminders}
+        except Exception as e:
+            self.logger.error(f"加载任务失败: {str(e)}")
             self.tasks = []
+            self.reminders = {}
+        self._rebuild_indexes()
+        # 汇总文件在修改时更新，这里只补上还没有的情况（比如从旧版本升级）
+        if not self.read_only and not os.path.exists(self.rollup_file):
+            self._schedule_rollup_save()
+
+    def _rebuild_indexes(self):
+        self._columns = None
+        self._tasks_by_id = {}
+        self._tasks_by_status = {}
+        self._tasks_by_date = {}
+        self._dates = []
+        self._rollups = DailyRollups()
+        for task in self.tasks:
+            self._index_task(task)
+            self._rollups.add_task(task)
+
+    def _index_task(self, task):
+        self._tasks_by_id[task.id] = task
+        self._tasks_by_status.setdefault(task.status, {})[task.id] = task
+
+        date = task.date
+        bucket = self._tasks_by_date.get(date)
+        if bucket is None:
+            bucket = self._tasks_by_date[date] = []
+            self._all_dates = None
+            # 新任务通常落在最新的日期上，直接追加即可
+            if not self._dates or date > self._dates[-1]:
+                self._dates.append(date)
+            else:
+                bisect.insort(self._dates, date)
+        bucket.append(task)
+
+    def _unindex_tasks(self, tasks):
+        """从任务列表和各个索引中去掉一批任务（归档时），只处理涉及的日期，返回 id 集合"""
+        ids = {task.id for task in tasks}
+        # 归档的是最早的任务，集中在列表前部，找齐后剩下的部分原样保留
+        missing = set(ids)
+        kept = []
+        end = 0
+        for end, task in enumerate(self.tasks):
+            if not missing:
+                break
+            if task.id in missing:
+                missing.discard(task.id)
+            else:
+                kept.append(task)
+        else:
+            end = len(self.tasks)
+        self.tasks[:end] = kept
+        dates = set()
+        for task in tasks:
+            self._tasks_by_id.pop(task.id, None)
+            bucket = self._tasks_by_status.get(task.status)
+            if bucket is not None:
+                bucket.pop(task.id, None)
+            dates.add(self._rollups.remove_task(task))
+        for date in dates:
+            remaining = [task for task in self._tasks_by_date.get(date, []) if task.id not in ids]
+            if remaining:
+                self._tasks_by_date[date] = remaining
+                continue
+            self._tasks_by_date.pop(date, None)
+            index = bisect.bisect_left(self._dates, date)
+            if index < len(self._dates) and self._dates[index] == date:
+                del self._dates[index]
+        self._all_dates = None
+        return ids
 
+    def _set_status(self, task, status):
+        """修改任务状态并同步状态索引"""
+        bucket = self._tasks_by_status.get(task.status)
+        if bucket is not None:
+            bucket.pop(task.id, None)
+        self._rollups.change_status(task.date, task.status, status)
+        self._schedule_rollup_save()
+        task.status = status
+        self._tasks_by_status.setdefault(status, {})[task.id] = task
+        if self._columns is not None:
+            self._columns.update(task)
+
+    @metrics.timed("save_tasks")
     def save_tasks(self):
+        """把全部任务写成新的快照（后台写入）"""
+        self.writer.submit_snapshot(
+            [task.to_dict() for task in self.tasks],
+            [reminder.to_dict() for reminder in self.reminders.values()]
+        )
+
+    def flush(self, timeout=None):
+        """等待后台写入完成，返回是否全部写入"""
+        return self.writer.flush(timeout)
+
+    def close(self):
+        """程序退出前调用，写完所有待写数据并关闭存储"""
+        self.writer.close()
         try:
-            with open(self.task_file, 'w', encoding='utf-8') as f:
-                json.dump(self.tasks, f, indent=4, ensure_ascii=False)
+            self.storage.close()
         except Exception as e:
-            self.logger.error(f"保存任务失败: {str(e)}")
+            self.logger.error(f"关闭存储失败: {str(e)}")
+        try:
+            metrics.save(self.metrics_file)
+        except Exception as e:
+            self.logger.error(f"保存性能指标失败: {str(e)}")
+
+    def _record(self, event, copy_event=True):
+        """记录一次修改：交给后台线程追加到日志，日志过长时由其合并成快照"""
+        event['ts'] = format_time(now())
+        metrics.count("tempus_mutations_total", op=event['op'])
+        self.writer.submit(event, copy_event)
 
+    def _record_baseline(self):
+        """事件流为空（第一次启用）时，先把当前的任务（包括已归档的）和提醒记为一批事件作为起点
+
+        这些数据已经在存储中，只写入事件流。
+        """
+        ts = format_time(now())
+        events = []
+        try:
+            for month in self.archive.months():
+                events.append({"op": "import", "tasks": self.archive.load_month(month), "ts": ts})
+        except Exception as e:
+            self.logger.error(f"读取归档任务失败: {str(e)}")
+        if self.tasks:
+            events.append({"op": "import", "tasks": [task.to_dict() for task in self.tasks], "ts": ts})
+        for reminder in self.reminders.values():
+            events.append({"op": "add_reminder", "reminder": reminder.to_dict(), "ts": ts})
+        self.writer.submit_logged(events)
+
+    @metrics.timed("create_task")
     def create_task(self, task_description, deadline):
-        task = {
-            "id": str(uuid.uuid4()),
-            "task": task_description,
-            "start_time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-            "initial_deadline": deadline.strftime("%Y-%m-%d %H:%M:%S"),
-            "current_deadline": deadline.strftime("%Y-%m-%d %H:%M:%S"),
-            "adjustments": [],
-            "completion_time": "",
-            "summary": "",
-            "status": "进行中",
-            "total_adjustments": 0,
-            "total_adjusted_time": 0
-        }
+        deadline = deadline.replace(microsecond=0)
+        task = Task(str(uuid.uuid4()), task_description, now(), deadline, deadline)
         self.tasks.append(task)
-        self.save_tasks()
-        self.logger.info(f'创建任务: "{task_description}"')
+        self._index_task(task)
+        self._rollups.add_task(task)
+        self._schedule_rollup_save()
+        if self._columns is not None:
+            self._columns.add(task)
+        self._update_search(task)
+        self._record({"op": "create", "task": task.to_dict()})
+        self.logger.info(f'创建任务: "{task_description}"', extra={"event": {
+            "op": "create", "id": task.id, "task": task_description,
+            "deadline": format_time(deadline)}})
         return task
 
+    @metrics.timed("adjust_task")
     def adjust_task(self, task_id, new_deadline, reason):
         task = self.get_task_by_id(task_id)
         if task:
-            original_deadline = task['current_deadline']
-            adjustment = {
-                "time": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-                "reason": reason,
-                "original_deadline": task['current_deadline'],
-                "new_deadline": new_deadline.strftime("%Y-%m-%d %H:%M:%S"),
-                "adjustment_count": len(task['adjustments']) + 1
-            }
-            task['adjustments'].append(adjustment)
-            task['current_deadline'] = new_deadline.strftime("%Y-%m-%d %H:%M:%S")
-            task['total_adjustments'] = len(task['adjustments'])
-
-            original_dt = datetime.strptime(original_deadline, "%Y-%m-%d %H:%M:%S")
-            adjusted_seconds = (new_deadline - original_dt).total_seconds()
-            task['total_adjusted_time'] += adjusted_seconds
-
-            self.save_tasks()
+            new_deadline = new_deadline.replace(microsecond=0)
+            original_deadline = task.current_deadline
+            adjustment = Adjustment(now(), reason, original_deadline, new_deadline,
+                                    len(task.adjustments) + 1)
+            task.adjustments.append(adjustment)
+            task.current_deadline = new_deadline
+            task.total_adjustments = len(task.adjustments)
+            task.total_adjusted_time += (new_deadline - original_deadline).total_seconds()
+            self._rollups.add_adjusted(task.date, (new_deadline - original_deadline).total_seconds())
+            self._schedule_rollup_save()
+            if self._columns is not None:
+                self._columns.update(task)
+            self._update_search(task)
+
+            self._record({
+                "op": "adjust",
+                "id": task_id,
+                "adjustment": adjustment.to_dict(),
+                "total_adjusted_time": task.total_adjusted_time
+            })
             self.logger.info(
-                f'调整任务 "{task["task"]}" 的截止时间\n'
+                f'调整任务 "{task.task}" 的截止时间\n'
                 f'  原因: {reason}\n'
-                f'  原时间: {original_deadline}\n'
-                f'  新时间: {task["current_deadline"]}'
+                f'  原时间: {format_time(original_deadline)}\n'
+                f'  新时间: {format_time(new_deadline)}',
+                extra={"event": {
+                    "op": "adjust", "id": task_id, "reason": reason,
+                    "original_deadline": format_time(original_deadline),
+                    "new_deadline": format_time(new_deadline),
+                    "total_adjusted_time": task.total_adjusted_time}}
             )
         else:
             self.logger.error(f"未找到任务 {task_id}")
 
+    @metrics.timed("complete_task")
     def complete_task(self, task_id, summary):
         task = self.get_task_by_id(task_id)
         if task:
-            task['completion_time'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-            task['summary'] = summary
-            task['status'] = "已完成"
-            self.save_tasks()
-            completion_msg = f'完成任务: "{task["task"]}"'
+            task.completion_time = now()
+            task.summary = summary
+            self._set_status(task, "已完成")
+            self._update_search(task)
+            self._record({
+                "op": "complete",
+                "id": task_id,
+                "completion_time": format_time(task.completion_time),
+                "summary": summary
+            })
+            completion_msg = f'完成任务: "{task.task}"'
             if summary:
                 completion_msg += f'\n  总结: {summary}'
-            self.logger.info(completion_msg)
+            self.logger.info(completion_msg, extra={"event": {
+                "op": "complete", "id": task_id, "status": task.status,
+                "completion_time": format_time(task.completion_time), "summary": summary}})
         else:
             self.logger.error(f"未找到任务 {task_id}")
 
     def update_task_status(self, task_id, status):
         task = self.get_task_by_id(task_id)
         if task:
-            task['status'] = status
-            self.save_tasks()
-            self.logger.info(f'任务 "{task["task"]}" 状态更新为: {status}')
+            self._set_status(task, status)
+            self._record({"op": "status", "id": task_id, "status": status})
+            self.logger.info(f'任务 "{task.task}" 状态更新为: {status}',
+                             extra={"event": {"op": "status", "id": task_id, "status": status}})
         else:
             self.logger.error(f"未找到任务 {task_id}")
 
+    @metrics.timed("archive_tasks")
+    def archive_tasks(self, max_age_days=None, limit=None):
+        """把开始于 max_age_days 天前、已完成或已超时的任务移到按月归档的分片，返回归档数量
+
+        limit 限制本次最多归档的任务数，界面分批调用，每批只占用界面线程很短的时间。
+        这里只更新内存中的索引和 manifest 计数，转换、压缩和写分片在后台写入线程中
+        先于删除事件完成，中途退出也不会丢失任务。
+        """
+        if max_age_days is None:
+            max_age_days = int(os.environ.get('TEMPUS_ARCHIVE_DAYS', DEFAULT_ARCHIVE_DAYS))
+        cutoff_time = (now() - timedelta(days=max_age_days)).replace(hour=0, minute=0, second=0, microsecond=0)
+        cutoff = cutoff_time.strftime('%Y-%m-%d')
+        old = []
+        for status in ("已完成", "已超时"):
+            for task in self._tasks_by_status.get(status, {}).values():
+                # 比较时间而不是 task.date，省去每个任务格式化日期
+                if task.start_time < cutoff_time:
+                    old.append(task)
+                    if limit is not None and len(old) >= limit:
+                        break
+            if limit is not None and len(old) >= limit:
+                break
+        if not old:
+            return 0
+        try:
+            self.archive.add(old)
+        except Exception as e:
+            self.logger.error(f"归档任务失败: {str(e)}")
+            return 0
+        self.writer.submit_job(self.archive.write_pending)
+
+        # 归档后的任务不再参与启动时的比对：索引已读取时直接补上，
+        # 否则记下这些任务，等第一次搜索读取索引时再从归档补上
+        if self._search is not None:
+            for task in old:
+                if not self._search.is_current(task):
+                    self._update_search(task)
+        else:
+            from .search_index import SearchIndex
+            archived = [(task.id, task.date) for task in old]
+            self.writer.submit_job(lambda: SearchIndex.mark_archived(self.data_dir, archived))
+            if self._search_loader is not None:
+                self._search_archived.extend(old)
+
+        ids = self._unindex_tasks(old)
+        if self._columns is not None:
+            self._columns.remove(old)
+        for month in {task.date[:7] for task in old}:
+            self._archived_months.pop(month, None)
+            self._archived_columns.pop(month, None)
+        self._archived_rollups = None
+        ids = sorted(ids)
+        self._record({"op": "archive", "ids": ids}, copy_event=False)
+        self.logger.info(f"归档了 {len(old)} 个 {cutoff} 之前的任务", extra={"event": {
+            "op": "archive", "ids": ids, "count": len(ids), "cutoff": cutoff}})
+        return len(old)
+
+    def preload_search_index(self):
+        """在后台线程读取（或重建）检索索引，打开历史记录时调用，界面线程不读归档分片
+
+        已读取或正在读取时什么也不做；search_ready() 为 True 后 get_search_index 不会阻塞。
+        """
+        if self._search is not None or self._search_loader is not None:
+            return
+        self._search_archived = []
+        tasks = list(self.tasks)
+
+        def load():
+            self._search_loaded = self._read_search_index(tasks)
+
+        self._search_loader = threading.Thread(target=load, name="SearchIndexLoader", daemon=True)
+        self._search_loader.start()
+
+    def search_ready(self):
+        """检索索引是否已经可以直接使用"""
+        if self._search is not None:
+            return True
+        return self._search_loader is not None and not self._search_loader.is_alive()
+
+    def get_search_index(self):
+        """返回全文检索索引；没有在后台预先读取时（比如命令行）在当前线程读取或重建
+
+        耗时的部分（读索引文件、从归档重建、补上归档标记）在 _read_search_index 中，
+        这里只把热数据中内容有变化的任务补进索引。
+        """
+        if self._search is not None:
+            return self._search
+        if self._search_loader is not None:
+            self._search_loader.join()
+            loaded, self._search_loaded = self._search_loaded, None
+            archived, self._search_archived = self._search_archived, []
+            self._search_loader = None
+        else:
+            loaded = self._read_search_index(list(self.tasks))
+            archived = []
+        if loaded is None:
+            return None
+        search, changed = loaded
+        # 读取期间有修改或被归档的任务
+        for task in self.tasks + archived:
+            if not search.is_current(task):
+                search.add(task)
+                changed = True
+        self._search = search
+        if changed:
+            self._schedule_search_save()
+        return search
+
+    def _read_search_index(self, tasks):
+        """读取索引文件，缺失时从归档和 tasks 重建，并补上索引未读取期间归档的任务
+
+        可在后台线程中调用：只读磁盘和 ArchiveStore（有自己的锁），不访问内存中的任务索引。
+        返回 (索引, 是否有改动)，失败时返回 None。
+        """
+        from .search_index import SearchIndex
+        search = SearchIndex(self.data_dir)
+        try:
+            loaded = search.load()
+        except Exception as e:
+            self.logger.error(f"读取检索索引失败，将重建: {str(e)}")
+            search = SearchIndex(self.data_dir)
+            loaded = False
+        try:
+            changed = False
+            if not loaded:
+                for month in self.archive.months():
+                    for data in self.archive.load_month(month):
+                        search.add(Task.from_dict(data))
+                changed = True
+            for task in tasks:
+                if not search.is_current(task):
+                    search.add(task)
+                    changed = True
+            # 索引未读取期间归档的任务，按月份到归档里取回；
+            # 即使内容没变也重新加入一次，增量里的归档标记才会在合并时去掉
+            by_month = {}
+            for task_id, date in search.archived.items():
+                by_month.setdefault(date[:7], set()).add(task_id)
+            for month, ids in sorted(by_month.items()):
+                for data in self.archive.load_month(month):
+                    if data['id'] in ids:
+                        search.add(Task.from_dict(data))
+                        changed = True
+            search.archived.clear()
+        except Exception as e:
+            self.logger.error(f"建立检索索引失败: {str(e)}")
+            return None
+        return search, changed
+
+    @metrics.timed("search_tasks")
+    def search_tasks(self, query, limit=200):
+        """全文搜索任务描述、总结和调整原因，返回 [(任务 id, 日期)]，按日期从新到旧"""
+        search = self.get_search_index()
+        if search is None:
+            return []
+        return search.search(query, limit)
+
+    def _update_search(self, task):
+        # 索引尚未读取时不用更新，读取时会按任务内容补上
+        if self._search is not None:
+            self._search.add(task)
+            self._schedule_search_save()
+
+    def _schedule_search_save(self):
+        """在后台写入线程中保存索引，两次保存之间的修改只保存一次"""
+        if not self._search_save_pending and not self.read_only:
+            self._search_save_pending = True
+            self.writer.submit_job(self._save_search)
+
+    def _save_search(self):
+        self._search_save_pending = False
+        self._search.save()
+
+    def get_day_rollup(self, date):
+        """某天（按开始日期）的汇总，包括已归档的任务，不需要读取任务本身；没有任务时返回 None"""
+        hot = self._rollups.get(date)
+        archived = self._get_archived_rollups().get(date)
+        if archived is None:
+            return dict(hot) if hot else None
+        total = dict(archived)
+        if hot:
+            for field in ROLLUP_FIELDS:
+                total[field] += hot[field]
+        return total
+
+    def get_rollups(self):
+        """全部日期的每日汇总（热数据与归档合并）"""
+        return self._rollups.merged(self._get_archived_rollups())
+
+    def _get_archived_rollups(self):
+        if self._archived_rollups is None:
+            try:
+                self._archived_rollups = self.archive.rollups()
+            except Exception as e:
+                self.logger.error(f"读取归档汇总失败: {str(e)}")
+                return DailyRollups()
+        return self._archived_rollups
+
+    def _schedule_rollup_save(self):
+        """在后台写入线程中把每日汇总写入 rollups.json，供其他工具直接读取"""
+        if not self._rollup_save_pending:
+            self._rollup_save_pending = True
+            self.writer.submit_job(self._save_rollups)
+
+    def _save_rollups(self):
+        self._rollup_save_pending = False
+        self.get_rollups().save(self.rollup_file)
+
+    def _archived_month(self, month):
+        """读取（或从缓存取）某月归档，返回 {日期: 任务列表}"""
+        tasks_by_date = self._archived_months.get(month)
+        if tasks_by_date is not None:
+            self._archived_months.move_to_end(month)
+            return tasks_by_date
+        tasks_by_date = {}
+        try:
+            for data in self.archive.load_month(month):
+                task = Task.from_dict(data)
+                tasks_by_date.setdefault(task.date, []).append(task)
+        except Exception as e:
+            self.logger.error(f"读取归档 {month} 失败: {str(e)}")
+            return {}
+        self._archived_months[month] = tasks_by_date
+        if len(self._archived_months) > self.ARCHIVED_MONTH_CACHE:
+            self._archived_months.popitem(last=False)
+        return tasks_by_date
+
+    def _dates_including_archived(self):
+        if self._all_dates is None:
+            self._all_dates = sorted(set(self._dates).union(self.archive.dates()))
+        return self._all_dates
+
+    @metrics.timed("import_tasks")
+    def import_tasks(self, records, adjustments=None):
+        """批量导入任务，records 为 (行号, 字典) 的迭代器，见 core.importer.read_records
+
+        adjustments 为 任务 id -> 调整记录列表（可选）。无效记录记入报告后跳过，
+        id 已存在（包括已归档）的任务不重复导入。整批任务作为一条 import 事件写入，只写一次磁盘。
+        """
+        from .importer import build_task, ImportReport
+        report = ImportReport()
+        tasks = []
+        seen = set()
+        for line_num, record in records:
+            try:
+                if isinstance(record, Exception):
+                    raise record
+                task_adjustments = None
+                if adjustments is not None and isinstance(record, dict):
+                    task_adjustments = adjustments.get(record.get('id') or "", [])
+                task = build_task(record, task_adjustments)
+            except (ValueError, TypeError, AttributeError) as e:
+                report.errors.append((line_num, str(e)))
+                continue
+            if task.id in self._tasks_by_id or task.id in seen:
+                report.skipped += 1
+                continue
+            seen.add(task.id)
+            tasks.append(task)
+
+        # 已归档的任务不在热数据索引里（导出默认包含归档），读取涉及月份的归档比对 id
+        archived_months = set(self.archive.months())
+        months = {task.date[:7] for task in tasks} & archived_months
+        if months:
+            archived_ids = set()
+            for month in sorted(months):
+                try:
+                    archived_ids.update(data['id'] for data in self.archive.load_month(month))
+                except Exception as e:
+                    self.logger.error(f"读取归档 {month} 失败: {str(e)}")
+            kept = [task for task in tasks if task.id not in archived_ids]
+            report.skipped += len(tasks) - len(kept)
+            tasks = kept
+
+        tasks.sort(key=lambda task: task.start_time)
+        for task in tasks:
+            self.tasks.append(task)
+            self._index_task(task)
+            self._rollups.add_task(task)
+            if self._columns is not None:
+                self._columns.add(task)
+            self._update_search(task)
+        if tasks:
+            self._schedule_rollup_save()
+            self._record({"op": "import", "tasks": [task.to_dict() for task in tasks]}, copy_event=False)
+            self.logger.info(f"批量导入 {len(tasks)} 个任务", extra={"event": {
+                "op": "import", "ids": [task.id for task in tasks], "count": len(tasks)}})
+        report.imported = len(tasks)
+        report.elapsed = time.perf_counter() - report.started
+        return report
+
+    def add_reminder(self, minutes):
+        """新建一个 minutes 分钟后的提醒并保存"""
+        reminder = Reminder(str(uuid.uuid4()), now() + timedelta(minutes=minutes), minutes)
+        self.reminders[reminder.id] = reminder
+        self._record({"op": "add_reminder", "reminder": reminder.to_dict()})
+        return reminder
+
+    def remove_reminders(self, reminders):
+        """移除已触发的提醒，一批提醒只记录一条事件"""
+        ids = [reminder.id for reminder in reminders if self.reminders.pop(reminder.id, None)]
+        if ids:
+            self._record({"op": "remove_reminders", "ids": ids})
+
+    def get_pending_reminders(self):
+        return list(self.reminders.values())
+
+    @metrics.timed("get_task_by_id")
     def get_task_by_id(self, task_id):
-        for task in self.tasks:
-            if task['id'] == task_id:
-                return task
-        return None
+        # 内存字典查找比数据库查询更快，且返回的是正在使用的任务对象
+        return self._tasks_by_id.get(task_id)
 
+    @metrics.timed("find_task")
+    def find_task(self, task_id, date=None):
+        """先查热数据，找不到且给出日期时再到该日期所在月份的归档里找"""
+        task = self._tasks_by_id.get(task_id)
+        if task is None and date is not None:
+            for archived in self._archived_month(date[:7]).get(date, []):
+                if archived.id == task_id:
+                    return archived
+        return task
+
+    def get_tasks_by_status(self, status):
+        """按状态取任务，例如 get_tasks_by_status("进行中")"""
+        return list(self._tasks_by_status.get(status, {}).values())
+
+    @metrics.timed("get_history_text")
     def get_history_text(self):
+        from .export import history_text
         if not self.tasks:
             return "暂无历史记录。"
-        history = ""
-        for task in self.tasks:
-            history += f"任务ID: {task['id']}\n"
-            history += f"任务描述: {task['task']}\n"
-            history += f"开始时间: {task['start_time']}\n"
-            history += f"初始截止时间: {task['initial_deadline']}\n"
-            history += f"当前截止时间: {task['current_deadline']}\n"
-            history += f"状态: {task['status']}\n"
-            if task['completion_time']:
-                history += f"完成时间: {task['completion_time']}\n"
-            if task['summary']:
-                history += f"总结: {task['summary']}\n"
-            history += f"总调整次数: {task['total_adjustments']}\n"
-            history += f"总调整时长: {timedelta(seconds=int(task['total_adjusted_time']))}\n"
-            history += "-" * 40 + "\n"
-        return history 
-
-    def get_tasks_by_date(self):
-        # 按日期分组的任务字典
-        tasks_by_date = {}
-        
-        for task in self.tasks:
-            date = task['start_time'].split()[0]  # 获取日期部分
-            if date not in tasks_by_date:
-                tasks_by_date[date] = []
-            tasks_by_date[date].append(task)
-        
-        # 按日期倒序排序
-        return dict(sorted(tasks_by_date.items(), reverse=True))
+        return "".join(history_text(task) for task in self.tasks)
+
+    def iter_tasks(self, start_date=None, end_date=None, status=None, include_archived=True):
+        """按开始时间从早到晚逐个产生任务，可按日期范围（包含两端）和状态筛选
+
+        一次只取一天的任务，归档月份按需读取，适合导出很长的历史。
+        """
+        dates = self._dates_including_archived() if include_archived else self._dates
+        lo = bisect.bisect_left(dates, start_date) if start_date else 0
+        hi = bisect.bisect_right(dates, end_date) if end_date else len(dates)
+        for date in dates[lo:hi]:
+            for task in self.get_tasks_on_date(date, include_archived):
+                if status is None or task.status == status:
+                    yield task
+
+    @metrics.timed("get_tasks_by_date")
+    def get_tasks_by_date(self, start_date=None, end_date=None, limit=None, include_archived=False):
+        """按日期倒序分组返回任务
+
+        start_date / end_date 为 "YYYY-MM-DD"，包含两端；limit 只取范围内最近的几天。
+        日期索引是有序的，耗时只与结果大小有关。include_archived 时只读取范围内月份的归档。
+        """
+        dates = self._dates_including_archived() if include_archived else self._dates
+        lo = bisect.bisect_left(dates, start_date) if start_date else 0
+        hi = bisect.bisect_right(dates, end_date) if end_date else len(dates)
+        if limit is not None:
+            lo = max(lo, hi - limit)
+        return {
+            date: self.get_tasks_on_date(date, include_archived)
+            for date in reversed(dates[lo:hi])
+        }
+
+    def get_dates(self, offset=0, limit=None, include_archived=False):
+        """从最近的日期往前数，跳过 offset 天后取 limit 天，返回日期列表"""
+        dates = self._dates_including_archived() if include_archived else self._dates
+        hi = len(dates) - offset
+        lo = 0 if limit is None else max(0, hi - limit)
+        return dates[lo:hi][::-1] if hi > 0 else []
+
+    def get_date_count(self, include_archived=False):
+        if include_archived:
+            return len(self._dates_including_archived())
+        return len(self._dates)
+
+    @metrics.timed("get_tasks_on_date")
+    def get_tasks_on_date(self, date, include_archived=False):
+        tasks = list(self._tasks_by_date.get(date, []))
+        # manifest 中没有这一天时不读取分片
+        if include_archived and self.archive.count_on(date):
+            tasks = self._archived_month(date[:7]).get(date, []) + tasks
+            tasks.sort(key=lambda task: task.start_time)
+        return tasks
+
+    @metrics.timed("get_stats")
+    def get_stats(self, start_date=None, end_date=None, include_archived=False):
+        """统计日期范围内（包含两端）的任务，见 core.stats.compute_stats
+
+        热数据的列在第一次统计时建立，之后由各个修改操作更新，这里只按日期范围取出；
+        归档部分按月建立列数据并缓存，该月再有任务归档时失效。
+        """
+        from .stats import ColumnCache, TaskColumns, compute_stats
+        if self._columns is None:
+            self._columns = ColumnCache(self.tasks)
+        parts = [self._columns.select(start_date, end_date)]
+        if include_archived:
+            for month in self.archive.months():
+                if (start_date and month < start_date[:7]) or (end_date and month > end_date[:7]):
+                    continue
+                columns = self._archived_columns.get(month)
+                if columns is None:
+                    tasks_by_date = self._archived_month(month)
+                    columns = ColumnCache(task for tasks in tasks_by_date.values() for task in tasks)
+                    # 读取失败时是空的，不缓存，下次重试
+                    if tasks_by_date:
+                        self._archived_columns[month] = columns
+                parts.append(columns.select(start_date, end_date))
+        return compute_stats(TaskColumns.concat(parts))
 
+    @metrics.timed("get_task_detail_text")
     def get_task_detail_text(self, task):
         """获取单个任务的详细信息"""
-        detail = f"📝 任务: {task['task']}\n"
-        detail += f"⏰ 开始时间: {task['start_time']}\n"
-        detail += f"📅 初始截止: {task['initial_deadline']}\n"
+        detail = f"📝 任务: {task.task}\n"
+        detail += f"⏰ 开始时间: {format_time(task.start_time)}\n"
+        detail += f"📅 初始截止: {format_time(task.initial_deadline)}\n"
         
-        if task['adjustments']:
+        if task.adjustments:
             detail += "\n⚡ 调整记录:\n"
-            for adj in task['adjustments']:
-                detail += f"  • 时间: {adj['time']}\n"
-                detail += f"    原因: {adj['reason']}\n"
-                detail += f"    从 {adj['original_deadline']} 改到 {adj['new_deadline']}\n"
+            for adj in task.adjustments:
+                detail += f"  • 时间: {format_time(adj.time)}\n"
+                detail += f"    原因: {adj.reason}\n"
+                detail += f"    从 {format_time(adj.original_deadline)} 改到 {format_time(adj.new_deadline)}\n"
         
-        if task['completion_time']:
-            detail += f"\n✅ 完成时间: {task['completion_time']}\n"
-        if task['summary']:
-            detail += f"📌 总结: {task['summary']}\n"
+        if task.completion_time:
+            detail += f"\n✅ 完成时间: {format_time(task.completion_time)}\n"
+        if task.summary:
+            detail += f"📌 总结: {task.summary}\n"
         
         detail += f"\n📊 统计:\n"
-        detail += f"  总调整次数: {task['total_adjustments']}\n"
-        detail += f"  总调整时长: {timedelta(seconds=int(task['total_adjusted_time']))}\n"
-        detail += f"  当前状态: {task['status']}"
+        detail += f"  总调整次数: {task.total_adjustments}\n"
+        detail += f"  总调整时长: {timedelta(seconds=int(task.total_adjusted_time))}\n"
+        detail += f"  当前状态: {task.status}"
         
         return detail 
\ No newline at end of file
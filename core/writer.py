@@ -0,0 +1,165 @@
+import atexit
+import copy
+import threading
+import time
+
+from . import metrics
+
+
+class BackgroundWriter:
+    """后台写入线程
+
+    TaskManager 的每次修改只把事件放进队列就返回，写入线程等待一小段时间，
+    把这期间积累的事件合并成一次写入，界面线程不再等待磁盘。
+    """
+
+    def __init__(self, storage, logger, delay=0.3, retry_delay=5, event_log=None):
+        self.storage = storage
+        self.logger = logger
+        self.event_log = event_log      # 可选，所有事件另外永久追加到这里
+        self.delay = delay              # 合并窗口（秒）
+        self.retry_delay = retry_delay  # 写入失败后的重试间隔（秒）
+        self._events = []
+        self._snapshot = None
+        self._jobs = []
+        self._logged = []  # 待写入 event_log 的事件，提交快照时不会被丢弃
+        self._busy = False
+        self._urgent = False
+        self._closed = False
+        self._cond = threading.Condition()
+        self._thread = threading.Thread(target=self._run, name="TaskWriter", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def submit(self, event, copy_event=True):
+        """提交一条修改事件，事件会被复制，调用方之后可以继续修改原对象
+
+        copy_event=False 时不复制，调用方传入新建的数据且之后不再修改（用于批量导入）。
+        """
+        with self._cond:
+            event = copy.deepcopy(event) if copy_event else event
+            self._events.append(event)
+            if self.event_log is not None:
+                self._logged.append(event)
+            self._cond.notify_all()
+
+    def submit_logged(self, events):
+        """只追加到 event_log、不写入存储的事件（调用方传入新建的数据，之后不再修改）"""
+        if self.event_log is None:
+            return
+        with self._cond:
+            self._logged.extend(events)
+            self._cond.notify_all()
+
+    def submit_snapshot(self, tasks, reminders):
+        """提交完整快照（调用方传入新建的数据，之后不再修改）
+
+        队列中尚未写入的事件已包含在快照里，直接丢弃。
+        """
+        with self._cond:
+            self._snapshot = (tasks, reminders)
+            self._events = []
+            self._cond.notify_all()
+
+    def submit_job(self, job):
+        """提交一个在写入线程中执行的函数，先于同批的快照和事件执行
+
+        失败时会连同快照和事件一起重试，job 需要能重复执行。
+        """
+        with self._cond:
+            self._jobs.append(job)
+            self._cond.notify_all()
+
+    def flush(self, timeout=None):
+        """立即写入所有待写数据并等待完成，超时返回 False"""
+        with self._cond:
+            self._urgent = True
+            self._cond.notify_all()
+            done = self._cond.wait_for(lambda: not self._has_work(), timeout)
+            self._urgent = False
+            return done
+
+    def close(self, timeout=10):
+        if self._closed:
+            return
+        if not self.flush(timeout):
+            self.logger.error("关闭时仍有任务数据未写入")
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._thread.join(timeout)
+
+    def _has_work(self):
+        return (self._busy or bool(self._events) or bool(self._jobs) or bool(self._logged)
+                or self._snapshot is not None)
+
+    def _run(self):
+        while True:
+            with self._cond:
+                self._cond.wait_for(lambda: self._closed or self._has_work())
+                if self._closed and not self._has_work():
+                    return
+                # 等待合并窗口结束，期间到达的修改合并成一次写入
+                if not self._urgent and not self._closed:
+                    self._cond.wait_for(lambda: self._urgent or self._closed, self.delay)
+                events, self._events = self._events, []
+                snapshot, self._snapshot = self._snapshot, None
+                jobs, self._jobs = self._jobs, []
+                logged, self._logged = self._logged, []
+                self._busy = True
+
+            ok = self._write(jobs, snapshot, events)
+            # 存储写入失败时事件记录也不写，重试时按原来的顺序一起写入
+            logged_ok = ok and self._write_event_log(logged)
+
+            with self._cond:
+                self._busy = False
+                # 写入失败时放回队列；若期间又提交了新快照，旧数据已被覆盖
+                if not ok:
+                    self._jobs = jobs + self._jobs
+                if not logged_ok:
+                    self._logged = logged + self._logged
+                if not ok and self._snapshot is None:
+                    self._snapshot = snapshot
+                    self._events = events + self._events
+                self._cond.notify_all()
+                if not ok or not logged_ok:
+                    if self._closed:
+                        return
+                    self._cond.wait_for(lambda: self._closed or self._urgent, self.retry_delay)
+
+    def _write_event_log(self, events):
+        if not events:
+            return True
+        try:
+            self.event_log.append(events)
+        except Exception as e:
+            self.logger.error(f"写入事件记录失败: {str(e)}")
+            return False
+        return True
+
+    def _write(self, jobs, snapshot, events):
+        started = time.perf_counter()
+        try:
+            for job in jobs:
+                job()
+            if snapshot is not None:
+                self.storage.save(*snapshot)
+                metrics.count("tempus_writes_total", kind="snapshot")
+            if events:
+                self.storage.append(events)
+                metrics.count("tempus_writes_total", kind="append")
+                metrics.count("tempus_events_written_total", len(events))
+        except Exception as e:
+            self.logger.error(f"写入任务数据失败: {str(e)}")
+            metrics.count("tempus_write_failures_total")
+            return False
+
+        try:
+            if self.storage.needs_compaction():
+                self.storage.compact()
+                metrics.count("tempus_writes_total", kind="compact")
+        except Exception as e:
+            self.logger.error(f"合并任务日志失败: {str(e)}")
+        metrics.observe("write", time.perf_counter() - started)
+        return True
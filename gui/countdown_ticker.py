@@ -0,0 +1,69 @@
+import heapq
+import itertools
+from datetime import datetime
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+
+class CountdownTicker(QObject):
+    """所有进行中任务共用的倒计时时钟
+
+    只有一个每秒触发的 QTimer，每次触发发出 tick 信号刷新所有倒计时；
+    截止时间放在最小堆里，每次只看堆顶，到期的任务通过 expired 信号一次发出。
+    没有任务时定时器停止。
+    """
+
+    tick = pyqtSignal(datetime)
+    expired = pyqtSignal(list)  # 本次到期的任务
+
+    INTERVAL_MS = 1000
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._tasks = {}   # 任务 id -> 任务
+        self._heap = []    # (截止时间, 序号, 任务 id)，调整时限后旧条目在出堆时丢弃
+        self._scheduled = {}  # 任务 id -> 堆中有效条目的序号，每个任务只有一个有效条目
+        self._counter = itertools.count()
+        self._timer = QTimer(self)
+        self._timer.timeout.connect(self._on_timeout)
+
+    def __len__(self):
+        return len(self._tasks)
+
+    def track(self, task):
+        """开始跟踪任务；加入时已经过了截止时间的任务不会再触发 expired"""
+        self._tasks[task.id] = task
+        self.reschedule(task)
+        if not self._timer.isActive():
+            self._timer.start(self.INTERVAL_MS)
+
+    def reschedule(self, task):
+        """任务截止时间变化后调用"""
+        if task.id in self._tasks and task.current_deadline > datetime.now():
+            seq = next(self._counter)
+            self._scheduled[task.id] = seq
+            heapq.heappush(self._heap, (task.current_deadline, seq, task.id))
+        else:
+            self._scheduled.pop(task.id, None)
+
+    def untrack(self, task):
+        self._tasks.pop(task.id, None)
+        self._scheduled.pop(task.id, None)
+        if not self._tasks:
+            self._timer.stop()
+            self._heap = []
+
+    def _on_timeout(self):
+        now = datetime.now()
+        self.tick.emit(now)
+
+        expired = []
+        while self._heap and self._heap[0][0] <= now:
+            _, seq, task_id = heapq.heappop(self._heap)
+            # 只有最近一次安排的条目有效，跳过已移除或截止时间已调整的旧条目；
+            # 截止时间改回原值或重复设置同一时间时，同一任务也只触发一次
+            if self._scheduled.get(task_id) == seq:
+                del self._scheduled[task_id]
+                expired.append(self._tasks[task_id])
+        if expired:
+            self.expired.emit(expired)
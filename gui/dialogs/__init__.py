@@ -1,9 +1,16 @@
-from .task_dialog import TaskDialog
-from .adjust_dialog import AdjustTimeDialog
-from .complete_dialog import CompleteTaskDialog
-from .history_dialog import HistoryDialog
-from .reminder_dialog import ReminderDialog
-from .message_dialog import MessageDialog
+import importlib
+
+# 对话框在第一次使用时才导入对应模块，主窗口启动时不加载用不到的对话框
+_MODULES = {
+    'TaskDialog': '.task_dialog',
+    'AdjustTimeDialog': '.adjust_dialog',
+    'CompleteTaskDialog': '.complete_dialog',
+    'HistoryDialog': '.history_dialog',
+    'ReminderDialog': '.reminder_dialog',
+    'MessageDialog': '.message_dialog',
+    'StatsDialog': '.stats_dialog',
+    'MetricsDialog': '.metrics_dialog',
+}
 
 __all__ = [
     'TaskDialog',
@@ -11,5 +18,20 @@ __all__ = [
     'CompleteTaskDialog',
     'HistoryDialog',
     'ReminderDialog',
-    'MessageDialog'
-] 
\ No newline at end of file
+    'MessageDialog',
+    'StatsDialog',
+    'MetricsDialog'
+]
+
+
+def __getattr__(name):
+    module = _MODULES.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value  # 之后直接从模块字典取，不再经过 __getattr__
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
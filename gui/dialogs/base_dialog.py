@@ -1,8 +1,14 @@
+import time
+
 from PyQt6.QtWidgets import QDialog, QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton
 from PyQt6.QtCore import Qt
 
+from TempusPugnus.core import metrics
+
 class BaseDialog(QDialog):
     def __init__(self, title="", parent=None):
+        # 从创建到第一次显示的耗时记为 open_类名
+        self._created = time.perf_counter() if metrics.ENABLED else None
         super().__init__(parent)
         # 设置无边框和透明背景
         self.setWindowFlags(
@@ -109,6 +115,12 @@ class BaseDialog(QDialog):
         
         self.layout.addWidget(title_container)
 
+    def showEvent(self, event):
+        if self._created is not None:
+            metrics.observe(f"open_{type(self).__name__}", time.perf_counter() - self._created)
+            self._created = None
+        super().showEvent(event)
+
     def mousePressEvent(self, event):
         if event.button() == Qt.MouseButton.LeftButton:
             self.pressing = True
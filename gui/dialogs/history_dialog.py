@@ -1,26 +1,44 @@
 from PyQt6.QtWidgets import (
     QDialog, QWidget, QVBoxLayout, QHBoxLayout, 
-    QLabel, QPushButton, QListWidget, QListWidgetItem, 
-    QTextEdit
+    QLabel, QPushButton, QListView, 
+    QTextEdit, QLineEdit
 )
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 from .base_dialog import BaseDialog
+from .history_model import HistoryModel
+
+from TempusPugnus.core import metrics
 
 class HistoryDialog(BaseDialog):
+    SEARCH_DELAY_MS = 200  # 停止输入这么久之后再搜索
+
     def __init__(self, task_manager, parent=None):
         super().__init__("📜 历史记录", parent)
         self.task_manager = task_manager
         self._setup_ui()
         self._load_tasks()
+        # 检索索引在后台读取，第一次搜索时不在界面线程上解压归档重建
+        self.task_manager.preload_search_index()
 
     def _setup_ui(self):
+        # 搜索框：搜索任务描述、总结和调整原因
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("🔍 搜索任务、总结、调整原因")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(self.SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(self._search)
+        self.search_edit.textChanged.connect(self.search_timer.start)
+
         # 内容区域
         content_layout = QHBoxLayout()
         content_layout.setSpacing(10)
         
-        # 左侧任务列表
-        self.task_list = QListWidget()
+        # 左侧任务列表，数据随滚动按页加载
+        self.task_list = QListView()
         self.task_list.setFixedWidth(200)
+        self.task_list.setUniformItemSizes(True)
         
         # 右侧详情区域
         self.detail_area = QTextEdit()
@@ -35,30 +53,37 @@ class HistoryDialog(BaseDialog):
         confirm_btn.clicked.connect(self.accept)
         
         # 添加到主布局
+        self.layout.addWidget(self.search_edit)
         self.layout.addLayout(content_layout)
         self.layout.addWidget(confirm_btn, alignment=Qt.AlignmentFlag.AlignCenter)
         
         # 连接信号
-        self.task_list.itemClicked.connect(self._show_task_detail)
+        self.task_list.clicked.connect(self._show_task_detail)
 
     def _load_tasks(self):
-        tasks_by_date = self.task_manager.get_tasks_by_date()
-        
-        for date, tasks in tasks_by_date.items():
-            # 添加日期标题
-            date_item = QListWidgetItem(f"📅 {date}")
-            date_item.setFlags(date_item.flags() & ~Qt.ItemFlag.ItemIsSelectable)
-            self.task_list.addItem(date_item)
-            
-            # 添加当天的任务
-            for task in tasks:
-                status_emoji = "✅" if task["status"] == "已完成" else "⏳"
-                task_item = QListWidgetItem(f"{status_emoji} {task['task']}")
-                task_item.setData(Qt.ItemDataRole.UserRole, task)
-                self.task_list.addItem(task_item)
+        self.model = HistoryModel(self.task_manager, self)
+        self.task_list.setModel(self.model)
+        # 先加载第一页，之后由列表滚动触发
+        if self.model.canFetchMore():
+            self.model.fetchMore()
+
+    @metrics.timed("history_search")
+    def _search(self):
+        query = self.search_edit.text().strip()
+        if query:
+            if not self.task_manager.search_ready():
+                # 索引还在后台读取，稍后再试
+                self.detail_area.setText("正在建立检索索引，请稍候…")
+                self.search_timer.start()
+                return
+            self.model.set_search_results(self.task_manager.search_tasks(query))
+        else:
+            self.model.set_search_results(None)
+            self.model.fetchMore()
+        self.detail_area.clear()
 
-    def _show_task_detail(self, item):
-        task = item.data(Qt.ItemDataRole.UserRole)
+    def _show_task_detail(self, index):
+        task = self.model.task_at(index)
         if task:  # 确保不是日期项
             detail_text = self.task_manager.get_task_detail_text(task)
             self.detail_area.setText(detail_text)
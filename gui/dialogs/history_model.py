@@ -0,0 +1,99 @@
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex
+
+
+class HistoryModel(QAbstractListModel):
+    """历史记录列表模型
+
+    行只保存日期或任务 id，显示时再向 TaskManager 查询任务内容；
+    日期按页加载，列表滚动到底部时由视图调用 fetchMore 继续加载，
+    滚动到归档的日期时才会读取对应月份的归档分片。
+    """
+
+    PAGE_SIZE = 30  # 每次加载的天数
+
+    def __init__(self, task_manager, parent=None):
+        super().__init__(parent)
+        self.task_manager = task_manager
+        self._rows = []  # ('date', 日期, None) 或 ('task', 任务 id, 日期)
+        self._loaded_dates = 0
+        self._searching = False  # 显示搜索结果时不再按页加载
+
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self._rows)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        kind, value, _ = self._rows[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            if kind == 'date':
+                return self._date_text(value)
+            task = self.task_at(index)
+            if task is None:
+                return None
+            status_emoji = "✅" if task.status == "已完成" else "⏳"
+            return f"{status_emoji} {task.task}"
+        if role == Qt.ItemDataRole.UserRole and kind == 'task':
+            return value
+        return None
+
+    def _date_text(self, date):
+        # 日期行显示当天汇总，数据来自每日汇总，不读取当天的任务
+        day = self.task_manager.get_day_rollup(date)
+        if not day:
+            return f"📅 {date}"
+        return f"📅 {date}  ✅{day['completed']} ⏰{day['timed_out']} / {day['created']}"
+
+    def task_at(self, index):
+        """返回任务行对应的任务，日期行返回 None"""
+        kind, task_id, date = self._rows[index.row()]
+        if kind != 'task':
+            return None
+        return self.task_manager.find_task(task_id, date)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        if self._rows[index.row()][0] == 'date':
+            return Qt.ItemFlag.ItemIsEnabled
+        return Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+
+    def set_search_results(self, results):
+        """显示搜索结果 [(任务 id, 日期)]（按日期从新到旧）；传入 None 恢复按日期分页"""
+        self.beginResetModel()
+        self._rows = []
+        self._loaded_dates = 0
+        self._searching = results is not None
+        last_date = None
+        for task_id, date in results or []:
+            if date != last_date:
+                self._rows.append(('date', date, None))
+                last_date = date
+            self._rows.append(('task', task_id, date))
+        self.endResetModel()
+
+    def canFetchMore(self, parent=QModelIndex()):
+        if parent.isValid() or self._searching:
+            return False
+        return self._loaded_dates < self.task_manager.get_date_count(include_archived=True)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        dates = self.task_manager.get_dates(self._loaded_dates, self.PAGE_SIZE, include_archived=True)
+        rows = []
+        for date in dates:
+            rows.append(('date', date, None))
+            rows.extend(
+                ('task', task.id, date)
+                for task in self.task_manager.get_tasks_on_date(date, include_archived=True)
+            )
+        self._loaded_dates += len(dates)
+        if not rows:
+            return
+        first = len(self._rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(rows) - 1)
+        self._rows.extend(rows)
+        self.endInsertRows()
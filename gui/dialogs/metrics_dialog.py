@@ -0,0 +1,52 @@
+from PyQt6.QtWidgets import QHBoxLayout, QPushButton, QTextEdit
+from PyQt6.QtCore import Qt
+from .base_dialog import BaseDialog
+
+from TempusPugnus.core import metrics
+
+
+class MetricsDialog(BaseDialog):
+    """调试用：显示本次运行记录的耗时和计数（Ctrl+Shift+M 打开）"""
+
+    def __init__(self, parent=None):
+        super().__init__("🛠️ 性能指标", parent)
+        self._setup_ui()
+        self._refresh()
+
+    def _setup_ui(self):
+        self.report_area = QTextEdit()
+        self.report_area.setReadOnly(True)
+        self.report_area.setFixedSize(520, 420)
+        self.report_area.setStyleSheet("font-family: monospace;")
+
+        button_layout = QHBoxLayout()
+        refresh_btn = QPushButton("刷新")
+        refresh_btn.clicked.connect(self._refresh)
+        confirm_btn = QPushButton("确定")
+        confirm_btn.clicked.connect(self.accept)
+        button_layout.addWidget(refresh_btn)
+        button_layout.addWidget(confirm_btn)
+
+        self.layout.addWidget(self.report_area)
+        self.layout.addLayout(button_layout)
+        self.layout.setAlignment(button_layout, Qt.AlignmentFlag.AlignCenter)
+
+    def _refresh(self):
+        if not metrics.ENABLED:
+            self.report_area.setText("性能指标未开启。\n设置环境变量 TEMPUS_METRICS=1 后重新启动程序。")
+            return
+        self.report_area.setText(self._format(metrics.snapshot()))
+
+    def _format(self, data):
+        text = f"{'操作':<24}{'次数':>8}{'平均':>10}{'p50':>10}{'p95':>10}  (ms)\n"
+        histograms = sorted(data["histograms"].items(), key=lambda item: -item[1]["sum"])
+        for op, histogram in histograms:
+            n = histogram["count"]
+            text += (f"{op:<24}{n:>8}{histogram['sum'] / n * 1000:>10.2f}"
+                     f"{metrics.quantile(histogram, 0.5) * 1000:>10.2f}"
+                     f"{metrics.quantile(histogram, 0.95) * 1000:>10.2f}\n")
+        text += "\n计数:\n"
+        for counter in sorted(data["counters"], key=lambda counter: counter["name"]):
+            labels = ",".join(f"{key}={value}" for key, value in counter["labels"].items())
+            text += f"  {counter['name']}{'{' + labels + '}' if labels else ''}: {counter['value']}\n"
+        return text
@@ -0,0 +1,94 @@
+from datetime import timedelta
+
+from PyQt6.QtWidgets import QHBoxLayout, QLabel, QPushButton, QComboBox, QTextEdit
+from PyQt6.QtCore import Qt
+from .base_dialog import BaseDialog
+
+from TempusPugnus.core.models import now
+
+
+class StatsDialog(BaseDialog):
+    # (显示名称, 天数)，None 表示全部记录（会读取归档）
+    RANGES = [("最近 7 天", 7), ("最近 30 天", 30), ("最近 90 天", 90), ("全部（含归档）", None)]
+
+    def __init__(self, task_manager, parent=None):
+        super().__init__("📊 统计", parent)
+        self.task_manager = task_manager
+        self._setup_ui()
+        self.range_box.setCurrentIndex(1)
+
+    def _setup_ui(self):
+        range_layout = QHBoxLayout()
+        range_layout.addWidget(QLabel("范围:"))
+        self.range_box = QComboBox()
+        self.range_box.setStyleSheet("""
+            QComboBox {
+                background-color: rgba(44, 62, 80, 180);
+                color: #FFD700;
+                border: 1px solid #DAA520;
+                border-radius: 4px;
+                padding: 3px 5px;
+                font-size: 13px;
+            }
+        """)
+        for name, _ in self.RANGES:
+            self.range_box.addItem(name)
+        self.range_box.currentIndexChanged.connect(self._refresh)
+        range_layout.addWidget(self.range_box)
+
+        self.report_area = QTextEdit()
+        self.report_area.setReadOnly(True)
+        self.report_area.setFixedSize(360, 420)
+
+        confirm_btn = QPushButton("确定")
+        confirm_btn.clicked.connect(self.accept)
+
+        self.layout.addLayout(range_layout)
+        self.layout.addWidget(self.report_area)
+        self.layout.addWidget(confirm_btn, alignment=Qt.AlignmentFlag.AlignCenter)
+
+    def _refresh(self, index):
+        days = self.RANGES[index][1]
+        start_date = None
+        if days is not None:
+            start_date = (now() - timedelta(days=days - 1)).strftime('%Y-%m-%d')
+        try:
+            stats = self.task_manager.get_stats(start_date, include_archived=days is None)
+        except Exception as e:
+            self.task_manager.logger.error(f"统计失败: {str(e)}")
+            self.report_area.setText(f"统计失败: {str(e)}")
+            return
+        self.report_area.setText(self._format(stats))
+
+    def _format(self, stats):
+        if not stats["total"]:
+            return "这段时间没有任务。"
+        text = f"📋 任务总数: {stats['total']}\n"
+        text += f"  已完成 {stats['completed']}，已超时 {stats['timed_out']}，进行中 {stats['in_progress']}\n"
+        text += f"✅ 完成率: {stats['completion_rate']:.1%}\n"
+
+        text += "\n⏰ 完成时间与初始截止时间相比:\n"
+        for label, count in stats["overrun"].items():
+            text += f"  {label}: {count}\n"
+        text += f"  中位数: {self._duration(stats['median_overrun'])}\n"
+
+        text += "\n🔄 截止时间调整:\n"
+        text += f"  调整过的任务: {stats['adjusted_ratio']:.1%}\n"
+        text += f"  平均调整次数: {stats['avg_adjustments']:.2f}\n"
+        text += f"  平均推迟: {self._duration(stats['avg_slippage'])}\n"
+        text += f"  调整过的任务平均推迟: {self._duration(stats['avg_adjusted_slippage'])}\n"
+
+        text += "\n📅 按星期完成数:\n"
+        text += self._bars(stats["by_weekday"].items())
+        text += "\n🕐 按小时完成数:\n"
+        text += self._bars((f"{hour:02d}时", count) for hour, count in enumerate(stats["by_hour"]) if count)
+        return text
+
+    def _bars(self, items, width=20):
+        items = list(items)
+        top = max((count for _, count in items), default=0) or 1
+        return "".join(f"  {label} {'█' * round(count * width / top)} {count}\n" for label, count in items)
+
+    def _duration(self, seconds):
+        sign = "-" if seconds < 0 else ""
+        return sign + str(timedelta(seconds=int(abs(seconds))))
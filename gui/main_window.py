@@ -3,26 +3,51 @@ from PyQt6.QtWidgets import (
     QMessageBox, QHBoxLayout, QDialog
 )
 from PyQt6.QtCore import Qt, QTimer, QDateTime
+from PyQt6.QtGui import QShortcut, QKeySequence
+import os
 from datetime import datetime, timedelta
 
-from TempusPugnus.gui.dialogs import TaskDialog, AdjustTimeDialog, CompleteTaskDialog, HistoryDialog, ReminderDialog, MessageDialog
+from TempusPugnus.gui import dialogs
 from TempusPugnus.core.task_manager import TaskManager
+from TempusPugnus.core import metrics
+from TempusPugnus.gui.reminder_scheduler import ReminderScheduler
+from TempusPugnus.gui.notification_center import NotificationCenter
+from TempusPugnus.gui.countdown_ticker import CountdownTicker
+from TempusPugnus.gui.task_row import TaskRow
+from TempusPugnus.gui.styles.default import TASK_LABEL_STYLE
 
 class TimeFistGUI(QMainWindow):
-    def __init__(self):
+    # 窗口显示后过这么久开始预先导入对话框模块，设置 TEMPUS_WARMUP=0 可关闭
+    WARMUP_DELAY_MS = 1000
+    # 启动后分批归档旧任务：每批最多这么多个，两批之间留出处理其他事件的时间
+    ARCHIVE_BATCH = 500
+    ARCHIVE_INTERVAL_MS = 20
+
+    def __init__(self, data_dir=None):
         super().__init__()
-        self.task_manager = TaskManager()
-        self.current_task = None
-        self.timer = QTimer(self)
-        self.timer.timeout.connect(self.update_countdown)
+        self.task_manager = TaskManager(data_dir)
+        self.current_task = None  # 当前选中的任务，完成/重设按钮作用于它
+        self.task_rows = {}       # 任务 id -> TaskRow
+        # 所有任务共用一个每秒触发的时钟，刷新倒计时并检查超时
+        self.ticker = CountdownTicker(self)
+        self.ticker.tick.connect(self.update_countdown)
+        self.ticker.expired.connect(self.handle_timeouts)
         self.pressing = False
         self.start_point = None
-        self.reminders = []  # 存储所有提醒
-        self.reminder_timer = QTimer(self)
-        self.reminder_timer.timeout.connect(self.check_reminders)
-        self.reminder_timer.start(1000)  # 每秒检查一次
+        # 提醒调度器只在最近的提醒到期时唤醒
+        self.reminder_scheduler = ReminderScheduler(self)
+        # 提醒和超时提示都通过非模态的通知队列显示
+        self.notifications = NotificationCenter(self)
+        self.reminder_scheduler.reminders_due.connect(self._on_reminders_due)
         self.init_ui()
-        self.countdown_label.hide()
+        self._restore_active_tasks()
+        # 已保存的提醒在窗口创建后再载入，不拖慢启动；关闭期间到期的提醒会合并成一次弹窗
+        QTimer.singleShot(0, self._load_reminders)
+        # 把已结束的旧任务移到按月归档的分片中，热数据只保留近期任务
+        QTimer.singleShot(0, self._archive_old_tasks)
+        # 对话框模块在第一次打开时才导入，这里在空闲时提前导入，第一次打开也不卡顿
+        if os.environ.get('TEMPUS_WARMUP', '1') != '0':
+            QTimer.singleShot(self.WARMUP_DELAY_MS, self._warm_up_dialogs)
 
     def init_ui(self):
         # 设置无边框窗口
@@ -87,41 +112,16 @@ class TimeFistGUI(QMainWindow):
         self.main_layout.addWidget(title_container)
 
     def _setup_task_area(self):
-        # 创建任务信息容器
+        # 创建任务信息容器，每个进行中的任务占一行
         task_container = QWidget()
-        task_layout = QHBoxLayout(task_container)
-        task_layout.setContentsMargins(0, 0, 0, 0)
-        task_layout.setSpacing(5)
-
-        # 任务标签
-        self.task_label = QLabel("🎯 当前没有进行中的任务")
-        self.task_label.setStyleSheet("""
-            background-color: rgba(26, 26, 46, 180);
-            color: #2ECC71;
-            border: 1px solid #DAA520;
-            border-radius: 5px;
-            padding: 5px 8px;
-            font-size: 16px;
-            font-weight: bold;
-        """)
-        
-        # 倒计时标签
-        self.countdown_label = QLabel("")
-        self.countdown_label.setStyleSheet("""
-            background-color: rgba(26, 26, 46, 180);
-            color: #E74C3C;
-            border: 1px solid #DAA520;
-            border-radius: 5px;
-            padding: 5px 8px;
-            font-size: 32px;
-            font-weight: bold;
-            min-width: 160px;
-            text-align: center;
-        """)
-        
-        # 添加到水平布局，1:1 比例
-        task_layout.addWidget(self.task_label, stretch=1)
-        task_layout.addWidget(self.countdown_label, stretch=1)
+        self.task_layout = QVBoxLayout(task_container)
+        self.task_layout.setContentsMargins(0, 0, 0, 0)
+        self.task_layout.setSpacing(5)
+
+        # 没有任务时显示的提示
+        self.empty_label = QLabel("🎯 当前没有进行中的任务")
+        self.empty_label.setStyleSheet(TASK_LABEL_STYLE)
+        self.task_layout.addWidget(self.empty_label)
         
         # 添加到主布局
         self.main_layout.addWidget(task_container)
@@ -137,6 +137,7 @@ class TimeFistGUI(QMainWindow):
         self.adjust_time_btn = QPushButton("🔄重设")
         self.history_btn = QPushButton("📜记录")
         self.reminder_btn = QPushButton("⏲️提醒")
+        self.stats_btn = QPushButton("📊统计")
 
         # 设置按钮样式
         button_style = """
@@ -151,7 +152,7 @@ class TimeFistGUI(QMainWindow):
         """
 
         for btn in [self.new_task_btn, self.complete_task_btn, 
-                   self.adjust_time_btn, self.history_btn, self.reminder_btn]:
+                   self.adjust_time_btn, self.history_btn, self.reminder_btn, self.stats_btn]:
             btn.setFixedWidth(50)
             btn.setStyleSheet(button_style)
             button_layout.addWidget(btn)
@@ -171,50 +172,137 @@ class TimeFistGUI(QMainWindow):
         self.adjust_time_btn.clicked.connect(self.adjust_task_time)
         self.history_btn.clicked.connect(self.view_history)
         self.reminder_btn.clicked.connect(self.set_reminder)
+        self.stats_btn.clicked.connect(self.view_stats)
+        # 调试用的性能指标窗口没有按钮，只能用快捷键打开
+        QShortcut(QKeySequence("Ctrl+Shift+M"), self, self.view_metrics)
 
     def create_new_task(self):
-        if self.current_task:
-            QMessageBox.warning(self, "提示", "请先完成当前任务！")
-            return
-
-        dialog = TaskDialog()
+        dialog = dialogs.TaskDialog()
         if dialog.exec() == QDialog.DialogCode.Accepted:
             task_description = dialog.task_description
             deadline_str = dialog.deadline_str
             
             try:
                 deadline = datetime.strptime(deadline_str, "%Y-%m-%d %H:%M:%S")
-                self.current_task = self.task_manager.create_task(task_description, deadline)
-                self.countdown_label.show()
-                self.task_label.setText(f"🎯 {self.current_task['task']}")
-                self.update_countdown()
-                self.timer.start(1000)
-                self.complete_task_btn.setEnabled(True)
-                self.adjust_time_btn.setEnabled(True)
+                self.show_task(self.task_manager.create_task(task_description, deadline))
             except Exception as e:
                 QMessageBox.critical(self, "错误", f"创建任务失败: {str(e)}")
 
-    def update_countdown(self):
-        if self.current_task:
-            now = datetime.now()
-            deadline = datetime.strptime(self.current_task['current_deadline'], "%Y-%m-%d %H:%M:%S")
-            remaining = deadline - now
-            if remaining.total_seconds() > 0:
-                self.countdown_label.setText(str(remaining).split('.')[0])
-            else:
-                self.countdown_label.setText("时间到！")
-                self.timer.stop()
-                self.handle_timeout()
-
-    def handle_timeout(self):
+    def show_task(self, task):
+        """为任务添加一行倒计时并选中它"""
+        row = TaskRow(task)
+        row.clicked.connect(self.select_task)
+        row.update_remaining(datetime.now())
+        self.task_rows[task.id] = row
+        self.task_layout.addWidget(row)
+        self.empty_label.hide()
+        self.ticker.track(task)
+        self.select_task(task)
+        self._fit_to_rows()
+
+    def remove_task(self, task):
+        """任务完成或超时后移除它的一行"""
+        row = self.task_rows.pop(task.id, None)
+        if row is None:
+            return
+        self.ticker.untrack(task)
+        self.task_layout.removeWidget(row)
+        row.deleteLater()
+        if self.current_task is task:
+            # 选中最近添加的另一个任务
+            remaining = list(self.task_rows.values())
+            self.select_task(remaining[-1].task if remaining else None)
+        if not self.task_rows:
+            self.empty_label.show()
+        self._fit_to_rows()
+
+    def _fit_to_rows(self):
+        # 新加入布局的行要到下一轮事件循环才显示，之后再按行数调整窗口高度
+        QTimer.singleShot(0, self.adjustSize)
+
+    def select_task(self, task):
+        self.current_task = task
+        for row in self.task_rows.values():
+            row.set_selected(row.task is task)
+        self.complete_task_btn.setEnabled(task is not None)
+        self.adjust_time_btn.setEnabled(task is not None)
+
+    def _restore_active_tasks(self):
+        """启动时恢复上次未结束的任务
+
+        进行中的任务直接从 TaskManager 的状态索引取出，不扫描历史记录。
+        未到期的任务恢复倒计时，已经超时的任务合并成一次提示处理。
+        """
+        active = sorted(self.task_manager.get_tasks_by_status("进行中"), key=lambda t: t.start_time)
+        if not active:
+            return
+        now = datetime.now()
+        pending = [task for task in active if task.current_deadline > now]
+        expired = [task for task in active if task.current_deadline <= now]
+
+        for task in pending:
+            self.show_task(task)
+        if len(expired) == 1:
+            # 只有一个超时任务时走普通的超时流程，可以直接调整时限
+            self.show_task(expired[0])
+            self.handle_timeout(expired[0])
+        elif expired:
+            self.handle_expired_tasks(expired)
+
+    def handle_expired_tasks(self, tasks):
+        mark_timeout_btn = QMessageBox.StandardButton.No
+        mark_complete_btn = QMessageBox.StandardButton.Apply
+        later_btn = QMessageBox.StandardButton.Cancel
+
+        msg_box = QMessageBox(self)
+        msg_box.setWindowModality(Qt.WindowModality.NonModal)
+        msg_box.setWindowTitle("任务超时")
+        names = "\n".join(f"• {task.task}" for task in tasks[:10])
+        if len(tasks) > 10:
+            names += f"\n……还有 {len(tasks) - 10} 个"
+        msg_box.setText(f"程序关闭期间有 {len(tasks)} 个任务已经超时：\n{names}\n\n请选择操作：")
+        msg_box.setStandardButtons(mark_timeout_btn | mark_complete_btn | later_btn)
+        msg_box.button(mark_timeout_btn).setText("全部标记超时")
+        msg_box.button(mark_complete_btn).setText("全部标记完成")
+        msg_box.button(later_btn).setText("稍后处理")
+
+        msg_box.finished.connect(lambda response: self._on_expired_choice(tasks, response))
+        self.notifications.show_dialog(msg_box)
+
+    def _on_expired_choice(self, tasks, response):
+        # 只处理仍在进行中的任务
+        tasks = [task for task in tasks if task.status == "进行中"]
+        if response == QMessageBox.StandardButton.No:
+            for task in tasks:
+                self.task_manager.update_task_status(task.id, "已超时")
+        elif response == QMessageBox.StandardButton.Apply:
+            for task in tasks:
+                self.task_manager.complete_task(task.id, "")
+        else:
+            # 稍后处理：显示为已超时的任务行，之后可以单独完成或调整
+            for task in tasks:
+                self.show_task(task)
+
+    @metrics.timed("update_countdown")
+    def update_countdown(self, now=None):
+        now = now or datetime.now()
+        for row in self.task_rows.values():
+            row.update_remaining(now)
+
+    def handle_timeouts(self, tasks):
+        for task in tasks:
+            self.handle_timeout(task)
+
+    def handle_timeout(self, task):
         # 使用 QMessageBox.StandardButton 创建三个按钮选项
         adjust_btn = QMessageBox.StandardButton.Yes
         complete_btn = QMessageBox.StandardButton.Apply
         timeout_btn = QMessageBox.StandardButton.No
 
         msg_box = QMessageBox(self)
+        msg_box.setWindowModality(Qt.WindowModality.NonModal)
         msg_box.setWindowTitle("任务超时")
-        msg_box.setText("任务已经超时，请选择操作：")
+        msg_box.setText(f"任务「{task.task}」已经超时，请选择操作：")
         msg_box.setStandardButtons(adjust_btn | complete_btn | timeout_btn)
         
         # 自定义按钮文本
@@ -222,19 +310,30 @@ class TimeFistGUI(QMainWindow):
         msg_box.button(complete_btn).setText("标记完成")
         msg_box.button(timeout_btn).setText("标记超时")
 
-        response = msg_box.exec()
+        # 非模态显示，选择结果通过 finished 信号返回
+        msg_box.finished.connect(lambda response: self._on_timeout_choice(task, response))
+        self.notifications.show_dialog(msg_box)
+
+    def _on_timeout_choice(self, task, response):
+        # 弹窗显示期间任务可能已经被手动完成
+        if task.status != "进行中":
+            return
 
-        if response == adjust_btn:
+        self.select_task(task)
+        if response == QMessageBox.StandardButton.Yes:
             self.adjust_task_time()
-        elif response == complete_btn:
+        elif response == QMessageBox.StandardButton.Apply:
             self.complete_task()
         else:  # timeout_btn
-            self.task_manager.update_task_status(self.current_task['id'], "已超时")
-            self.reset_task_ui()
-            QMessageBox.information(self, "提示", "任务已标记为超时")
+            self.task_manager.update_task_status(task.id, "已超时")
+            self.remove_task(task)
+            self.notifications.notify("提示", "任务已标记为超时")
 
     def adjust_task_time(self):
-        dialog = AdjustTimeDialog()
+        task = self.current_task
+        if task is None:
+            return
+        dialog = dialogs.AdjustTimeDialog()
         if dialog.exec() == QDialog.DialogCode.Accepted:
             try:
                 selected_datetime = dialog.new_deadline_input.dateTime()
@@ -249,30 +348,46 @@ class TimeFistGUI(QMainWindow):
                 if new_deadline <= datetime.now():
                     new_deadline += timedelta(days=1)
                 
-                self.task_manager.adjust_task(self.current_task['id'], new_deadline, reason)
-                self.current_task = self.task_manager.get_task_by_id(self.current_task['id'])
-                self.update_countdown()
-                self.timer.start(1000)
+                # adjust_task 直接修改任务对象，无需重新查找
+                self.task_manager.adjust_task(task.id, new_deadline, reason)
+                self.ticker.reschedule(task)
+                self.task_rows[task.id].update_remaining(datetime.now())
             except Exception as e:
                 QMessageBox.critical(self, "错误", f"调整时间失败: {str(e)}")
 
     def complete_task(self):
-        dialog = CompleteTaskDialog()
+        task = self.current_task
+        if task is None:
+            return
+        dialog = dialogs.CompleteTaskDialog()
         if dialog.exec() == QDialog.DialogCode.Accepted:
             summary = dialog.summary
-            self.task_manager.complete_task(self.current_task['id'], summary)
-            self.reset_task_ui()
-
-    def reset_task_ui(self):
-        self.current_task = None
-        self.task_label.setText("🎯 当前没有进行中的任务")
-        self.countdown_label.hide()
-        self.timer.stop()
-        self.complete_task_btn.setEnabled(False)
-        self.adjust_time_btn.setEnabled(False)
+            self.task_manager.complete_task(task.id, summary)
+            self.remove_task(task)
+
+    def _archive_old_tasks(self):
+        """每次只归档一批，第一次升级时有大量旧任务也不会长时间卡住界面"""
+        if self.task_manager.archive_tasks(limit=self.ARCHIVE_BATCH) >= self.ARCHIVE_BATCH:
+            QTimer.singleShot(self.ARCHIVE_INTERVAL_MS, self._archive_old_tasks)
+
+    def _warm_up_dialogs(self, names=None):
+        """每次事件循环只导入一个对话框模块，不连续占用界面线程"""
+        if names is None:
+            names = list(dialogs.__all__)
+        if names:
+            getattr(dialogs, names.pop(0))
+            QTimer.singleShot(0, lambda: self._warm_up_dialogs(names))
 
     def view_history(self):
-        dialog = HistoryDialog(self.task_manager, None)
+        dialog = dialogs.HistoryDialog(self.task_manager, None)
+        dialog.exec()
+
+    def view_stats(self):
+        dialog = dialogs.StatsDialog(self.task_manager, None)
+        dialog.exec()
+
+    def view_metrics(self):
+        dialog = dialogs.MetricsDialog(None)
         dialog.exec()
 
     def mousePressEvent(self, event):
@@ -291,43 +406,24 @@ class TimeFistGUI(QMainWindow):
             self.start_point = None
 
     def set_reminder(self):
-        dialog = ReminderDialog(None)
+        dialog = dialogs.ReminderDialog(None)
         if dialog.exec() == QDialog.DialogCode.Accepted:
             minutes = dialog.get_minutes()
-            reminder_time = datetime.now() + timedelta(minutes=minutes)
-            self.reminders.append({
-                'time': reminder_time,
-                'minutes': minutes
-            })
+            reminder = self.task_manager.add_reminder(minutes)
+            self.reminder_scheduler.schedule(reminder.time, reminder)
             
-            # 使用自定义消息对话框，父窗口设为 None
-            msg_dialog = MessageDialog(
+            self.notifications.notify(
                 "⏲️ 提醒已设置",
-                f"将在 {minutes} 分钟后提醒您\n({reminder_time.strftime('%H:%M:%S')})",
-                None
+                f"将在 {minutes} 分钟后提醒您\n({reminder.time.strftime('%H:%M:%S')})"
             )
-            msg_dialog.exec()
 
-    def check_reminders(self):
-        now = datetime.now()
-        remaining_reminders = []
-        triggered_reminders = []
-
-        for reminder in self.reminders:
-            if now >= reminder['time']:
-                triggered_reminders.append(reminder)
-            else:
-                remaining_reminders.append(reminder)
-
-        self.reminders = remaining_reminders
-
-        for reminder in triggered_reminders:
-            # 使用自定义消息对话框，父窗口设为 None
-            msg_dialog = MessageDialog(
-                "⏰ 来了！",
-                f"您设置的 {reminder['minutes']} 分钟提醒时间到了！",
-                None
-            )
-            msg_dialog.exec()
+    def _load_reminders(self):
+        self.reminder_scheduler.schedule_many(
+            (reminder.time, reminder) for reminder in self.task_manager.get_pending_reminders()
+        )
+
+    def _on_reminders_due(self, reminders):
+        self.task_manager.remove_reminders(reminders)
+        self.notifications.notify_reminders(reminders)
 
     # ... 其他方法继续拆分 ... 
\ No newline at end of file
@@ -0,0 +1,67 @@
+from collections import deque
+from datetime import datetime
+
+from PyQt6.QtCore import QObject
+
+from TempusPugnus.gui import dialogs
+
+
+class NotificationCenter(QObject):
+    """非模态通知队列
+
+    通知按顺序排队，一次只显示一个弹窗，用 show() 显示而不是 exec()，
+    所以弹窗打开时倒计时和提醒定时器照常运行。
+    还没来得及显示的提醒会合并到同一个弹窗里。
+    """
+
+    MAX_REMINDER_LINES = 10  # 合并弹窗中最多列出的提醒条数
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._queue = deque()  # 待显示的对话框，或待合并的提醒列表
+        self._current = None
+
+    def notify(self, title, message):
+        self.show_dialog(dialogs.MessageDialog(title, message, None))
+
+    def notify_reminders(self, reminders):
+        # 队尾还有未显示的提醒时直接合并进去
+        if self._queue and isinstance(self._queue[-1], list):
+            self._queue[-1].extend(reminders)
+        else:
+            self._queue.append(list(reminders))
+        self._show_next()
+
+    def show_dialog(self, dialog):
+        """排队显示任意对话框，关闭（finished）后显示下一个"""
+        self._queue.append(dialog)
+        self._show_next()
+
+    def _show_next(self):
+        if self._current is not None or not self._queue:
+            return
+        item = self._queue.popleft()
+        if isinstance(item, list):
+            item = dialogs.MessageDialog("⏰ 来了！", self._reminder_message(item), None)
+        self._current = item
+        item.finished.connect(self._on_finished)
+        item.show()
+        item.raise_()
+
+    def _on_finished(self):
+        self._current.deleteLater()
+        self._current = None
+        self._show_next()
+
+    def _reminder_message(self, reminders):
+        if len(reminders) == 1:
+            return f"您设置的 {reminders[0].minutes} 分钟提醒时间到了！"
+        today = datetime.now().date()
+        lines = [f"有 {len(reminders)} 个提醒时间到了："]
+        for reminder in reminders[:self.MAX_REMINDER_LINES]:
+            # 程序关闭期间错过的提醒可能不是今天的
+            time_format = '%H:%M:%S' if reminder.time.date() == today else '%m-%d %H:%M'
+            lines.append(f"• {reminder.minutes} 分钟提醒（{reminder.time.strftime(time_format)}）")
+        if len(reminders) > self.MAX_REMINDER_LINES:
+            lines.append(f"……还有 {len(reminders) - self.MAX_REMINDER_LINES} 个")
+        return "\n".join(lines)
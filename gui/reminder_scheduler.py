@@ -0,0 +1,61 @@
+import heapq
+import itertools
+from datetime import datetime
+
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+
+
+class ReminderScheduler(QObject):
+    """提醒调度器
+
+    提醒按到期时间放在最小堆里，只用一个单次 QTimer 定到最近的到期时间，
+    触发或插入后重新设定。没有待触发的提醒时不会有任何定时唤醒。
+    """
+
+    reminders_due = pyqtSignal(list)  # 同一时刻到期的提醒
+
+    # 最长等待一小时再重新计算，以免系统时间调整后长时间不触发
+    MAX_INTERVAL_MS = 60 * 60 * 1000
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._heap = []  # (到期时间, 序号, 提醒)，序号保证同时到期时按插入顺序
+        self._counter = itertools.count()
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self._fire)
+
+    def __len__(self):
+        return len(self._heap)
+
+    def schedule(self, due_time, reminder):
+        """O(log n) 插入一个提醒，只有它成为最早的提醒时才重新设定定时器"""
+        entry = (due_time, next(self._counter), reminder)
+        heapq.heappush(self._heap, entry)
+        if self._heap[0] is entry:
+            self._arm()
+
+    def schedule_many(self, items):
+        """批量插入 (到期时间, 提醒)，一次 heapify 即可"""
+        for due_time, reminder in items:
+            self._heap.append((due_time, next(self._counter), reminder))
+        heapq.heapify(self._heap)
+        self._arm()
+
+    def _arm(self):
+        if not self._heap:
+            self._timer.stop()
+            return
+        delay = (self._heap[0][0] - datetime.now()).total_seconds()
+        # 多加 1 毫秒，避免定时器略早触发时找不到到期的提醒
+        interval = min(max(0, int(delay * 1000) + 1), self.MAX_INTERVAL_MS)
+        self._timer.start(interval)
+
+    def _fire(self):
+        now = datetime.now()
+        due = []
+        while self._heap and self._heap[0][0] <= now:
+            due.append(heapq.heappop(self._heap)[2])
+        self._arm()
+        if due:
+            self.reminders_due.emit(due)
@@ -8,4 +8,30 @@ MAIN_WINDOW_STYLE = """
     }
 """
 
-# 可以继续添加其他样式常量 
\ No newline at end of file
+# 任务标签（选中的任务使用亮金色边框）
+TASK_LABEL_STYLE = """
+    background-color: rgba(26, 26, 46, 180);
+    color: #2ECC71;
+    border: 1px solid #DAA520;
+    border-radius: 5px;
+    padding: 5px 8px;
+    font-size: 16px;
+    font-weight: bold;
+"""
+
+SELECTED_TASK_LABEL_STYLE = TASK_LABEL_STYLE.replace("1px solid #DAA520", "2px solid #FFD700")
+
+# 倒计时标签
+COUNTDOWN_LABEL_STYLE = """
+    background-color: rgba(26, 26, 46, 180);
+    color: #E74C3C;
+    border: 1px solid #DAA520;
+    border-radius: 5px;
+    padding: 5px 8px;
+    font-size: 32px;
+    font-weight: bold;
+    min-width: 160px;
+    text-align: center;
+"""
+
+# 可以继续添加其他样式常量
@@ -0,0 +1,48 @@
+from PyQt6.QtWidgets import QWidget, QHBoxLayout, QLabel
+from PyQt6.QtCore import pyqtSignal
+
+from .styles.default import TASK_LABEL_STYLE, SELECTED_TASK_LABEL_STYLE, COUNTDOWN_LABEL_STYLE
+
+
+class TaskRow(QWidget):
+    """主窗口中的一行任务：任务描述 + 倒计时，点击选中"""
+
+    clicked = pyqtSignal(object)
+
+    def __init__(self, task, parent=None):
+        super().__init__(parent)
+        self.task = task
+        self._text = None
+
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        layout.setSpacing(5)
+
+        self.task_label = QLabel(f"🎯 {task.task}")
+        self.task_label.setStyleSheet(TASK_LABEL_STYLE)
+
+        self.countdown_label = QLabel("")
+        self.countdown_label.setStyleSheet(COUNTDOWN_LABEL_STYLE)
+
+        # 1:1 比例
+        layout.addWidget(self.task_label, stretch=1)
+        layout.addWidget(self.countdown_label, stretch=1)
+
+    def update_remaining(self, now):
+        remaining = self.task.current_deadline - now
+        if remaining.total_seconds() > 0:
+            text = str(remaining).split('.')[0]
+        else:
+            text = "时间到！"
+        # 文字没变时不触发重绘
+        if text != self._text:
+            self._text = text
+            self.countdown_label.setText(text)
+
+    def set_selected(self, selected):
+        self.task_label.setStyleSheet(SELECTED_TASK_LABEL_STYLE if selected else TASK_LABEL_STYLE)
+
+    def mousePressEvent(self, event):
+        self.clicked.emit(self.task)
+        # 交给主窗口继续处理，保持拖动功能
+        event.ignore()
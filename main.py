@@ -1,10 +1,16 @@
 from PyQt6.QtWidgets import QApplication
+import gc
 import sys
 from TempusPugnus.gui.main_window import TimeFistGUI
 
 def main():
     app = QApplication(sys.argv)
     gui = TimeFistGUI()
+    # 启动时加载的任务会一直留在内存中，移出循环垃圾回收的扫描范围，
+    # 否则每次完整回收都要遍历全部任务，界面会卡顿上百毫秒（不再引用的对象仍按引用计数释放）
+    gc.freeze()
+    # 退出前写完后台队列中的任务数据
+    app.aboutToQuit.connect(gui.task_manager.close)
     gui.show()
     sys.exit(app.exec())
 